@@ -0,0 +1,93 @@
+"""
+Benchmark inputs built from the checked-in samples.
+
+    titles   NARA file titles from category_samples_10_per_category.json and the 1000 page
+             extraction sample
+    texts    page texts (priority_text) from the 1000 page extraction sample
+    places   places the LLM extracted for the same sample (input of normalize_place)
+
+Inputs of any size are seeded draws (with replacement) from these pools, so a benchmark at
+size n always sees the same rows. use_corpus() swaps the titles / texts / pages pools for the
+pages of a synthetic_corpus.py parquet (places stay those of the sample).
+"""
+
+import json
+import os
+import random
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+PROJECTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTRACTION_SAMPLE = os.path.join(PROJECTS_DIR, 'interactive/data/extracted_LLM/extracted_amounts_sample_1000_with_text.json')
+CATEGORY_SAMPLES = os.path.join(PROJECTS_DIR, 'interactive/data/WIP/category_samples_10_per_category.json')
+
+_pools = {}
+
+
+def _load_pools():
+    if _pools:
+        return _pools
+    with open(EXTRACTION_SAMPLE, 'r', encoding='utf-8') as f:
+        pages = [page for page in json.load(f) if page.get('priority_text')]
+    with open(CATEGORY_SAMPLES, 'r', encoding='utf-8') as f:
+        category_samples = json.load(f)
+
+    titles = [page['title'] for page in pages]
+    for samples in category_samples['single_category_samples'].values():
+        titles.extend(sample['title'] for sample in samples)
+    titles.extend(sample['title'] for sample in category_samples['multi_category_samples'])
+
+    _pools['pages'] = pages
+    _pools['titles'] = titles
+    _pools['texts'] = [page['priority_text'] for page in pages]
+    _pools['places'] = [page['extracted_pension_amount'].get('place') for page in pages
+                        if isinstance(page.get('extracted_pension_amount'), dict)
+                        and page['extracted_pension_amount'].get('place')]
+    return _pools
+
+
+def use_corpus(path, max_pages=200_000):
+    """Pools from the first max_pages pages with OCR of a page table (e.g. synthetic_corpus.py output)."""
+    _load_pools()
+    pages = []
+    for batch in pq.ParquetFile(path).iter_batches(columns=['NAID', 'pageObjectId', 'title', 'ocrText']):
+        pages.extend(page for page in batch.to_pylist() if page['ocrText'])
+        if len(pages) >= max_pages:
+            break
+    pages = pages[:max_pages]
+    for page in pages:
+        page['priority_text'] = page.pop('ocrText')
+    _pools['pages'] = pages
+    _pools['titles'] = list({page['title']: None for page in pages})
+    _pools['texts'] = [page['priority_text'] for page in pages]
+    return len(pages)
+
+
+def draw(pool_name, n, seed=0):
+    """n seeded draws from a pool ('titles', 'texts', 'places' or 'pages')."""
+    return random.Random(f'{pool_name}:{seed}').choices(_load_pools()[pool_name], k=n)
+
+
+def titles_df(n, seed=0):
+    """Grouped-table shaped frame (NAID, title) for set_categories / run_categories."""
+    return pd.DataFrame({'NAID': [str(i) for i in range(n)], 'title': draw('titles', n, seed)})
+
+
+def pages_df(n, seed=0):
+    """Page-table shaped frame (title, ocrText, transcriptionText) for process_deterministic_only."""
+    pages = draw('pages', n, seed)
+    texts = [page['priority_text'] for page in pages]
+    return pd.DataFrame({
+        'NAID': [page['NAID'] for page in pages],
+        'title': [page['title'] for page in pages],
+        'ocrText': texts,
+        # every other page has a transcription, as in the full table
+        'transcriptionText': [text if i % 2 else None for i, text in enumerate(texts)],
+    })
+
+
+def page_records(n, seed=0):
+    """llm_runner.load_records shaped records (str keys + priority_text) for the router."""
+    return [{'NAID': str(page['NAID']), 'pageObjectId': str(page['pageObjectId']), 'title': page['title'],
+             'priority_text': page['priority_text']} for page in draw('pages', n, seed)]
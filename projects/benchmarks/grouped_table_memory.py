@@ -0,0 +1,163 @@
+"""
+Memory of the grouped NAID table (df_grouped_NAID_sorted_title_categories.parquet) before and
+after the compact dtype plan (pension_pipeline/grouped_table.py).
+
+The grouped table is categorized with run_categories and written twice:
+
+    before   every column as strings (NAID, file_type, file_cat, naraURL, pageURL, title_prefix),
+             as 2_run_set_categories wrote it with df.to_parquet
+    after    write_grouped - int64 NAID, category file_type / file_cat, URL prefixes stripped
+
+Each file is read back the way the notebooks read it (pd.read_parquet, and read_grouped for the
+compact file) and the in-memory size (memory_usage(deep=True)), the file size and the read time
+are reported, total and for the columns the plan changes, with an estimate for the real corpus
+(78,926 applications). pandas 3 reads parquet strings as Arrow-backed str columns; with
+--object-strings text columns are turned into Python object strings after reading, which is how
+pandas < 3 (the notebooks' environment) holds them.
+
+The input is a grouped table (synthetic_corpus.py --grouped output) or, without --grouped-input,
+one built in memory from --applications synthetic applications.
+
+Usage:
+    python grouped_table_memory.py
+    python grouped_table_memory.py --applications 20000 --object-strings
+    python grouped_table_memory.py --grouped-input synthetic/df_grouped_NAID_sorted_title.parquet
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pyarrow as pa
+
+import fixtures
+from synthetic_corpus import CORPUS_APPLICATIONS, generate_chunk, group_by_naid
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCHMARKS_DIR, 'results', 'grouped_memory.json')
+
+sys.path.append(fixtures.PROJECTS_DIR)
+
+from pension_pipeline.grouped_table import read_grouped, write_grouped  # noqa: E402
+from pension_pipeline.set_categories import run_categories  # noqa: E402
+
+CHANGED_COLUMNS = ['NAID', 'file_type', 'file_cat', 'naraURL', 'pageURL', 'pdfURL', 'title_prefix',
+                   'pagePath', 'pdfPath']
+
+
+def build_grouped(applications, seed=42, chunk_size=1000):
+    """Grouped table of `applications` synthetic applications (same layout as notebook 1's output)."""
+    import pandas as pd
+
+    chunks = [group_by_naid(generate_chunk(seed, start, min(chunk_size, applications - start)))
+              for start in range(0, applications, chunk_size)]
+    return pd.concat(chunks, ignore_index=True).sort_values(by='title', kind='stable')
+
+
+def legacy_strings(df):
+    """The categorized table as the old writer stored it - every column a string."""
+    df = df.copy()
+    for column in ('NAID', 'file_type', 'file_cat'):
+        df[column] = df[column].astype(str)
+    return df
+
+
+def as_object_strings(df):
+    """Text columns as Python object strings (pandas < 3 default)."""
+    import pandas as pd
+
+    for column in df.columns:
+        if pd.api.types.is_string_dtype(df[column].dtype) and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df
+
+
+def measure(label, path, read, object_strings=False):
+    """{'file_mb', 'read_s', 'memory_mb', 'columns_mb'} for reading path with read(path)."""
+    start = time.perf_counter()
+    df = read(path)
+    if object_strings:
+        df = as_object_strings(df)
+    read_s = time.perf_counter() - start
+    usage = df.memory_usage(deep=True, index=False)
+    result = {
+        'rows': len(df),
+        'file_mb': os.path.getsize(path) / 2 ** 20,
+        'read_s': read_s,
+        'memory_mb': usage.sum() / 2 ** 20,
+        'columns_mb': {column: usage[column] / 2 ** 20 for column in CHANGED_COLUMNS if column in usage},
+        'dtypes': {column: str(df[column].dtype) for column in CHANGED_COLUMNS if column in df.columns},
+    }
+    print(f"  {label:<28}{result['memory_mb']:>10,.1f} MB in memory {result['file_mb']:>9,.1f} MB on disk"
+          f" {read_s * 1000:>9,.0f} ms read")
+    return result
+
+
+def run(grouped, object_strings=False):
+    """Write / read the categorized table both ways; returns {label: measurement}."""
+    categorized = run_categories(grouped.copy())
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        before_path = os.path.join(directory, 'before.parquet')
+        after_path = os.path.join(directory, 'after.parquet')
+        legacy_strings(categorized).to_parquet(before_path, index=False)
+        write_grouped(categorized, after_path)
+
+        import pandas as pd
+        readers = {
+            'before (strings)': (before_path, pd.read_parquet),
+            'after (pd.read_parquet)': (after_path, pd.read_parquet),
+            'after (read_grouped)': (after_path, read_grouped),
+            'after, urls=True': (after_path, lambda path: read_grouped(path, urls=True)),
+        }
+        for label, (path, read) in readers.items():
+            results[label] = measure(label, path, read, object_strings)
+    return results
+
+
+def print_columns(results):
+    before, after = results['before (strings)'], results['after (read_grouped)']
+    print("\nChanged columns (MB in memory):")
+    for column in CHANGED_COLUMNS:
+        if column in before['columns_mb'] or column in after['columns_mb']:
+            old = before['columns_mb'].get(column)
+            new = after['columns_mb'].get(column)
+            print(f"  {column:<14}{'-' if old is None else f'{old:,.2f}':>10} -> {'dropped' if new is None else f'{new:,.2f}':>8}"
+                  f"   {before['dtypes'].get(column, '')} -> {after['dtypes'].get(column, '')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Memory of the grouped NAID table before / after the compact dtypes')
+    parser.add_argument('--applications', type=int, default=5000, help='synthetic applications to build')
+    parser.add_argument('--grouped-input', help='grouped table parquet to use instead (synthetic_corpus.py --grouped)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--object-strings', action='store_true', help='hold text columns as object strings (pandas < 3)')
+    args = parser.parse_args()
+
+    import pandas as pd
+    if args.grouped_input:
+        grouped = pd.read_parquet(args.grouped_input)
+        print(f"Grouped table: {len(grouped):,} applications from {args.grouped_input}")
+    else:
+        grouped = build_grouped(args.applications, seed=args.seed)
+        print(f"Grouped table: {len(grouped):,} synthetic applications (seed {args.seed})")
+    strings = 'object strings' if args.object_strings else 'default string dtype'
+    print(f"pandas {pd.__version__}, pyarrow {pa.__version__}, {strings}\n")
+
+    results = run(grouped, args.object_strings)
+    print_columns(results)
+
+    before, after = results['before (strings)'], results['after (read_grouped)']
+    scale = CORPUS_APPLICATIONS / before['rows']
+    print(f"\nIn memory: {before['memory_mb']:,.1f} MB -> {after['memory_mb']:,.1f} MB"
+          f" ({after['memory_mb'] / before['memory_mb']:.2f}x); at the real corpus size"
+          f" ~{before['memory_mb'] * scale:,.0f} MB -> ~{after['memory_mb'] * scale:,.0f} MB")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'pandas': pd.__version__,
+                   'pyarrow': pa.__version__, 'object_strings': args.object_strings, 'results': results}, f, indent=2)
+    print(f"\n✓ Results saved to {RESULTS_PATH}")
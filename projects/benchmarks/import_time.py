@@ -0,0 +1,142 @@
+"""
+Cold-start cost of the pipeline entry points.
+
+Each module is imported in a fresh interpreter (`python -X importtime -c "import <module>"`,
+run from the module's directory as the notebooks / scripts do), --repeat times; the median
+cumulative import time is reported together with the heavy libraries the import pulled in
+(pandas, nltk, ...) and its slowest direct imports. Interpreter startup itself (wall time of
+`python -c pass`) is shown first.
+
+Results are written to results/import_latest.json; --save-baseline stores them as
+results/import_baseline.json and later runs print the change against it.
+
+Usage:
+    python import_time.py
+    python import_time.py --only pension_pipeline.normalize_pension_act_date word_frequency --repeat 10
+    python import_time.py --save-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import fixtures
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'import_baseline.json')
+LATEST_PATH = os.path.join(RESULTS_DIR, 'import_latest.json')
+
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'scipy', 'nltk', 'google.genai']
+
+# module -> directory it is imported from (relative to projects/)
+ENTRY_POINTS = {
+    'pension_pipeline': '.',
+    'pension_pipeline.set_categories': '.',
+    'pension_pipeline.non_llm_parsing': '.',
+    'pension_pipeline.clean_ocr_text': '.',
+    'pension_pipeline.extract_all_samples_v3': '.',
+    'pension_pipeline.normalize_state': '.',
+    'pension_pipeline.normalize_frequency': '.',
+    'pension_pipeline.normalize_yearly_amount': '.',
+    'pension_pipeline.normalize_pension_act_date': '.',
+    'llm_runner': 'interactive/data/extracted_LLM',
+    'pre_extract_router': 'interactive/data/extracted_LLM',
+    'join_llm_results': 'interactive/data/extracted_LLM',
+    'word_frequency': 'interactive/data/frequency_counts',
+    'ngram_counts': 'interactive/data/frequency_counts',
+    'category_cube': 'interactive/data/frequency_counts',
+    'pipeline': 'interactive/data',
+}
+
+
+def parse_importtime(stderr):
+    """[(self us, cumulative us, depth, module)] from -X importtime output (depth 0 = top level)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def time_import(module, directory, repeat=5):
+    """{'ms', 'heavy', 'slowest'} for importing module in `repeat` fresh interpreters (median), or {'error'}."""
+    code = f'import {module}' if module else 'pass'
+    totals, rows = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=directory,
+                                capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            return {'error': result.stderr.strip().splitlines()[-1]}
+        rows = parse_importtime(result.stderr)
+        # the module is the last top-level row; its cumulative time covers everything it imported
+        totals.append(rows[-1][1] / 1000 if module else wall * 1000)
+    # direct imports of the module (depth 1 rows after the previous top-level row)
+    start = max((i for i, (_, _, depth, _) in enumerate(rows[:-1]) if depth == 0), default=-1) + 1
+    direct = {name: cumulative for _, cumulative, depth, name in rows[start:-1] if depth == 1}
+    loaded = {name for _, _, _, name in rows[start:]}
+    return {
+        'ms': round(statistics.median(totals), 1),
+        'heavy': [name for name in HEAVY_MODULES if name in loaded],
+        'slowest': sorted(((name, round(us / 1000, 1)) for name, us in direct.items()), key=lambda item: -item[1])[:3],
+    }
+
+
+def run(names=None, repeat=5):
+    results = {}
+    startup = time_import(None, BENCHMARKS_DIR, repeat)
+    print(f"  {'(interpreter startup)':<46}{startup['ms']:>9.1f} ms")
+    results['(interpreter startup)'] = startup
+    for module in names or ENTRY_POINTS:
+        result = time_import(module, os.path.join(fixtures.PROJECTS_DIR, ENTRY_POINTS[module]), repeat)
+        results[module] = result
+        if 'error' in result:
+            print(f"  {module:<46}   failed: {result['error']}")
+            continue
+        slowest = ', '.join(f"{name} {ms:.0f}" for name, ms in result['slowest'])
+        print(f"  {module:<46}{result['ms']:>9.1f} ms   heavy: {', '.join(result['heavy']) or '-':<36}{slowest}")
+    return results
+
+
+def compare(results, baseline):
+    print(f"\nCompared with the baseline from {baseline.get('created', '?')}:")
+    for module, result in results.items():
+        base = baseline['results'].get(module)
+        if base and 'error' not in base and 'error' not in result:
+            print(f"  {module:<46}{base['ms']:>9.1f} ms -> {result['ms']:>7.1f} ms"
+                  f"   heavy: {', '.join(base['heavy']) or '-'} -> {', '.join(result['heavy']) or '-'}")
+
+
+def save(results, path):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': sys.version.split()[0],
+                   'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure the cold import time of the pipeline entry points')
+    parser.add_argument('--only', nargs='+', choices=list(ENTRY_POINTS), help='modules to time (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per module (median is kept)')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    args = parser.parse_args()
+
+    print(f"Timing cold imports (median of {args.repeat})...")
+    results = run(args.only, args.repeat)
+    save(results, LATEST_PATH)
+    if args.save_baseline:
+        save(results, BASELINE_PATH)
+        print(f"\n✓ Baseline saved to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    print(f"\n✓ Results saved to {LATEST_PATH}")
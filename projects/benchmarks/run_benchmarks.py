@@ -0,0 +1,177 @@
+"""
+Throughput benchmarks for the hot functions and stages of the data pipeline.
+
+Every benchmark runs at several input sizes on seeded inputs drawn from the checked-in samples
+(see fixtures.py) and reports the best of --repeat runs as seconds and rows per second.
+
+    function   clean_up_text_fast, extract_dates_from_text, extract_pension_info_v4,
+               normalize_place, set_application_categories
+    stage      run_categories, clean_ocr_batch, process_deterministic_only,
+               PensionInfoExtractor.extract_batch, pre_extract_router.route_records
+
+--corpus draws the inputs from a page table instead (synthetic_corpus.py output), for runs at
+10x / 100x the real corpus.
+
+Results are written to results/latest.json. --save-baseline stores them as
+results/baseline.json; later runs print the change against the baseline for every
+benchmark and size, and flag anything slower than --threshold.
+
+Usage:
+    python run_benchmarks.py --save-baseline
+    python run_benchmarks.py                              # compare with the baseline
+    python run_benchmarks.py --only normalize_place run_categories --sizes 1000 100000
+    python run_benchmarks.py --fail-on-regression         # exit 1 on a regression
+    python run_benchmarks.py --corpus synthetic/nara_pension_file_pages.parquet --sizes 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import fixtures
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+LATEST_PATH = os.path.join(RESULTS_DIR, 'latest.json')
+
+sys.path.append(fixtures.PROJECTS_DIR)
+sys.path.append(os.path.join(fixtures.PROJECTS_DIR, 'interactive/data/extracted_LLM'))
+
+from pension_pipeline.clean_ocr_text import clean_ocr_batch, clean_up_text_fast  # noqa: E402
+from pension_pipeline.extract_all_samples_v3 import PensionInfoExtractor, extract_pension_info_v4  # noqa: E402
+from pension_pipeline.non_llm_parsing import extract_dates_from_text, process_deterministic_only  # noqa: E402
+from pension_pipeline.normalize_state import normalize_place  # noqa: E402
+from pension_pipeline.set_categories import run_categories, set_application_categories, set_categories  # noqa: E402
+from pre_extract_router import route_records  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def _each(function):
+    """Benchmark body that calls function once per input row."""
+    def run(rows):
+        for row in rows:
+            function(row)
+    return run
+
+
+def _quiet(function):
+    """Benchmark body for functions that print progress."""
+    def run(data):
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(data)
+    return run
+
+
+# name -> (group, input builder(n), body(input)); bodies that modify a DataFrame get a fresh copy
+BENCHMARKS = {
+    'clean_up_text_fast': ('function', lambda n: fixtures.draw('texts', n), _each(clean_up_text_fast)),
+    'extract_dates_from_text': ('function', lambda n: fixtures.draw('texts', n), _each(extract_dates_from_text)),
+    'extract_pension_info_v4': ('function', lambda n: fixtures.draw('texts', n), _each(extract_pension_info_v4)),
+    'normalize_place': ('function', lambda n: fixtures.draw('places', n), _each(normalize_place)),
+    'set_application_categories': ('function', lambda n: set_categories(fixtures.titles_df(n)),
+                                   lambda df: set_application_categories(df.copy())),
+    'run_categories': ('stage', fixtures.titles_df, lambda df: run_categories(df.copy())),
+    'clean_ocr_batch': ('stage', lambda n: fixtures.draw('texts', n), clean_ocr_batch),
+    'process_deterministic_only': ('stage', fixtures.pages_df, _quiet(process_deterministic_only)),
+    'extract_batch': ('stage', lambda n: fixtures.draw('texts', n), PensionInfoExtractor().extract_batch),
+    'route_records': ('stage', fixtures.page_records, route_records),
+}
+
+
+def time_benchmark(name, n, repeat=3):
+    """Best wall time (seconds) of `repeat` runs of a benchmark on n input rows."""
+    _, build, body = BENCHMARKS[name]
+    data = build(n)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(names=None, sizes=DEFAULT_SIZES, repeat=3):
+    """{benchmark name: {size: {'seconds', 'rows_per_s'}}}, printed as it goes."""
+    results = {}
+    for name in names or BENCHMARKS:
+        group = BENCHMARKS[name][0]
+        results[name] = {}
+        for n in sizes:
+            seconds = time_benchmark(name, n, repeat=repeat)
+            results[name][str(n)] = {'seconds': seconds, 'rows_per_s': n / seconds if seconds else None}
+            print(f"  {group:<9}{name:<28}{n:>9,} rows {seconds * 1000:>11.1f} ms {n / seconds:>13,.0f} rows/s")
+    return results
+
+
+def machine_info():
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(), 'cpus': os.cpu_count()}
+
+
+def compare(results, baseline, threshold=1.2):
+    """Print time ratios against the baseline; returns the (name, size) pairs slower than threshold."""
+    regressions = []
+    print(f"\nCompared with the baseline from {baseline.get('created', '?')} (ratio = new time / baseline time):")
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            base = baseline['results'].get(name, {}).get(size)
+            if not base:
+                continue
+            ratio = result['seconds'] / base['seconds']
+            flag = ''
+            if ratio > threshold:
+                flag = '  <-- slower'
+                regressions.append((name, size))
+            elif ratio < 1 / threshold:
+                flag = '  faster'
+            print(f"  {name:<28}{int(size):>9,} rows {ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def save_results(results, path):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'machine': machine_info(), 'results': results},
+                  f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline hot paths')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='benchmarks to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='input sizes (rows)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark and size (best is kept)')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=1.2, help='time ratio counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--corpus', help='page table parquet to draw inputs from (see synthetic_corpus.py)')
+    args = parser.parse_args()
+
+    if args.corpus:
+        print(f"Drawing inputs from {fixtures.use_corpus(args.corpus):,} pages of {args.corpus}")
+
+    print(f"Running benchmarks (sizes {', '.join(f'{n:,}' for n in args.sizes)}, best of {args.repeat})...")
+    results = run_benchmarks(args.only, args.sizes, args.repeat)
+    save_results(results, LATEST_PATH)
+
+    if args.save_baseline:
+        save_results(results, BASELINE_PATH)
+        print(f"\n✓ Baseline saved to {BASELINE_PATH}")
+        sys.exit(0)
+
+    regressions = []
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    else:
+        print("\nNo baseline yet - run with --save-baseline to create one")
+    print(f"\n✓ Results saved to {LATEST_PATH}")
+    if regressions and args.fail_on_regression:
+        print(f"{len(regressions)} regression(s) over {args.threshold}x")
+        sys.exit(1)
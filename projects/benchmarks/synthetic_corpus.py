@@ -0,0 +1,404 @@
+"""
+Seeded synthetic pension corpus for scale testing.
+
+Writes a page table with the same columns as nara_pension_file_pages.parquet (one row per page,
+pages of an application share a NAID), at any size:
+
+    titles      NARA format - "Revolutionary War Pension and Bounty Land Warrant Application
+                File S. 8997, for Samuel Marshall, Virginia" - with soldier / widow / rejected /
+                bounty land warrant / old war / N.A. Acc. files (some with two file numbers) and a
+                few non-application titles (family records, microfilm target sheets)
+    ocrText     cover / index cards, award roll cards with allowance phrases ("Inscribed on the
+                Roll of ... at the rate of 53 Dollars 33 Cents per annum ... Act June 7, 1832"),
+                declarations, widow declarations, Pension Office letters and briefs - some pages
+                with several '||'-joined sections - with OCR noise (letter confusions, | for I,
+                split words, dropped characters); a few pages have no OCR
+    transcriptionText  clean text for a small share of pages, as in the real table
+
+Every application is generated from its own RandomState seeded with (--seed, application index),
+so the output depends only on --seed and the size (not on --workers or --chunk-size). Chunks of
+applications are generated in worker processes (at most 2 * workers chunks in flight, as in
+pension_pipeline.cli.map_chunks) and streamed to parquet one chunk at a time, so memory stays
+flat at 100x the real corpus. --grouped also writes the NAID-grouped table
+(df_grouped_NAID_sorted_title.parquet layout, '||'-joined), grouped chunk by chunk as it is
+written - rows are sorted by title within each chunk only, not across the file.
+
+Usage:
+    python synthetic_corpus.py --applications 1000 --output synthetic/nara_pension_file_pages.parquet
+    python synthetic_corpus.py --scale 10 --workers 8 --grouped
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import fixtures
+
+sys.path.append(fixtures.PROJECTS_DIR)
+
+from pension_pipeline.cli import map_chunks  # noqa: E402
+
+# size of the real table: 78,926 applications (NAIDs), ~28 pages each
+CORPUS_APPLICATIONS = 78926
+MEAN_PAGES = 28
+MAX_PAGES = 999  # pageObjectIds are NAID + 1 .. NAID + pages
+
+STRING_COLUMNS = [
+    'NAID', 'naraURL', 'title', 'logicalDate', 'variantControlNumbers', 'pdfObjectID', 'pdfURL',
+    'pageObjectId', 'pageURL', 'pageImageType', 'ocrID', 'ocrText', 'ocrUploadDate', 'ocrContributor',
+    'transcriptionID', 'transcriptionText',
+]
+SCHEMA = pa.schema(
+    [(column, pa.string()) for column in STRING_COLUMNS]
+    + [('transcriptionContributionCount', pa.int64()), ('transcriptionUserNames', pa.string()),
+       ('transcriptionDate', pa.string())]
+)
+# columns notebook 1 drops before grouping by NAID
+METADATA_COLUMNS = ['transcriptionDate', 'transcriptionUserNames', 'transcriptionContributionCount', 'transcriptionID',
+                    'ocrID', 'ocrUploadDate', 'ocrContributor', 'variantControlNumbers']
+
+APPLICATION_PREFIX = 'Revolutionary War Pension and Bounty Land Warrant Application File'
+
+FIRST_NAMES = ['John', 'William', 'James', 'Samuel', 'Joseph', 'Thomas', 'David', 'Benjamin', 'Daniel', 'Jonathan',
+               'Ebenezer', 'Nathaniel', 'Peter', 'Isaac', 'Abraham', 'Jacob', 'Elijah', 'Moses', 'Josiah', 'Stephen',
+               'Richard', 'Charles', 'George', 'Henry', 'Robert', 'Micah', 'Reuben', 'Asa', 'Levi', 'Silas']
+WIDOW_NAMES = ['Mary', 'Sarah', 'Elizabeth', 'Hannah', 'Abigail', 'Anna', 'Martha', 'Lydia', 'Rebecca', 'Ruth',
+               'Susanna', 'Lucy', 'Esther', 'Rachel', 'Phebe', 'Margaret', 'Eunice', 'Experience']
+SURNAMES = ['Smith', 'Brown', 'Clark', 'Jones', 'Williams', 'Johnson', 'Davis', 'Miller', 'Wilson', 'Moore',
+            'Taylor', 'Anderson', 'Thomas', 'Jackson', 'White', 'Harris', 'Martin', 'Thompson', 'Wood', 'Hall',
+            'Allen', 'Young', 'King', 'Wright', 'Hill', 'Scott', 'Green', 'Adams', 'Baker', 'Nelson',
+            'Carter', 'Mitchell', 'Parker', 'Collins', 'Stewart', 'Morris', 'Rogers', 'Reed', 'Cook', 'Morgan',
+            'Bell', 'Murphy', 'Bailey', 'Cooper', 'Howard', 'Ward', 'Cox', 'Woodbury', 'Marshall', 'Critchfield',
+            'Coleman', 'Kennedy', 'Porter', 'Murray', 'Hills', 'Earle', 'Patten', 'Coggshall', 'Banker', 'Mc Lain']
+# (full name, title / index card abbreviation, weight)
+STATES = [('Massachusetts', 'Mass.', 14), ('Connecticut', 'Conn.', 10), ('New York', 'N.Y.', 11),
+          ('Virginia', 'Va.', 12), ('Pennsylvania', 'Penn.', 8), ('North Carolina', 'N.C.', 8),
+          ('New Hampshire', 'N.H.', 6), ('New Jersey', 'N.J.', 5), ('Maryland', 'Md.', 4), ('Vermont', 'Vt.', 4),
+          ('South Carolina', 'S.C.', 5), ('Rhode Island', 'R.I.', 3), ('Georgia', 'Ga.', 3), ('Delaware', 'Del.', 1)]
+COUNTIES = ['Essex', 'Worcester', 'Hartford', 'Windham', 'Albany', 'Dutchess', 'Augusta', 'Fauquier', 'Chester',
+            'Bucks', 'Rowan', 'Hillsborough', 'Rockingham', 'Morris', 'Windsor', 'Washington', 'Franklin']
+RANKS = ['Private', 'Private', 'Private', 'Private', 'Sergeant', 'Corporal', 'Drummer', 'Fifer', 'Lieutenant',
+         'Ensign', 'Captain']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October',
+          'November', 'December']
+# (act date, share of award cards)
+ACTS = [('June 7, 1832', 0.55), ('March 18, 1818', 0.25), ('July 4, 1836', 0.08), ('July 7, 1838', 0.07),
+        ('February 3, 1853', 0.05)]
+
+# (file type, title token, weight) - token None for non-application titles
+FILE_TYPES = [('soldier', 'S.', 44), ('widow', 'W.', 24), ('rejected', 'R.', 12), ('bounty land warrant', 'B.L.Wt.', 8),
+              ('old war', 'Old War Inv. File', 2), ('N A Acc', 'N.A. Acc. No. 874', 2), ('blank', '[Blank]', 3),
+              ('family record', None, 3), ('microfilm target sheet', None, 2)]
+
+PAGE_KINDS = ['cover', 'award', 'declaration', 'widow_declaration', 'letter', 'brief', 'fragment']
+PAGE_WEIGHTS = [0.12, 0.08, 0.28, 0.08, 0.16, 0.06, 0.22]
+
+OCR_CONFUSIONS = {'e': 'c', 'c': 'e', 'l': '1', 'i': 'l', 'o': '0', 's': 'f', 'm': 'rn', 'h': 'b', 'u': 'n',
+                  'n': 'u', 'a': 'o', 't': 'f', 'I': '|', 'S': '5', 'B': '8', 'O': '0'}
+
+
+def _choice(rng, items, weights=None):
+    if weights is None:
+        return items[rng.randint(len(items))]
+    weights = np.asarray(weights, dtype=float)
+    return items[rng.choice(len(items), p=weights / weights.sum())]
+
+
+def _date(rng, start_year, end_year):
+    return rng.randint(1, 29), _choice(rng, MONTHS), rng.randint(start_year, end_year + 1)
+
+
+def _ordinal(day):
+    return f"{day}{'th' if 10 <= day % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')}"
+
+
+def make_title(rng, application):
+    file_type, token = application['file_type'], application['token']
+    name, state, abbr = application['name'], application['state'], application['abbr']
+    if token is None:
+        if file_type == 'family record':
+            return f"Illustrated Family Record (Fraktur) Found in Revolutionary War Pension File {name}, {state}"
+        return f"Microfilm Target Sheet, Revolutionary War Pension Files, Roll {rng.randint(1, 2671)}"
+    number = application['number']
+    if token == 'B.L.Wt.':
+        file_number = f"B.L.Wt. {number}-{_choice(rng, ['100', '160-55', '200', '300'])}"
+    elif token == '[Blank]':
+        file_number = f"{_choice(rng, ['S.', 'W.', 'R.'])} {number}"
+        state = '[Blank]'
+    else:
+        file_number = f"{token} {number:,}" if rng.rand() < 0.1 else f"{token} {number}"
+    if rng.rand() < 0.1:
+        # second file number, e.g. 'W. 7735, B.L.Wt. 26293-160-55'
+        file_number += f", B.L.Wt. {rng.randint(1000, 99999)}-160-55"
+    place = state if state == '[Blank]' or rng.rand() < 0.6 else abbr
+    return f"{APPLICATION_PREFIX} {file_number}, {'for ' if rng.rand() < 0.5 else ''}{name}, {place}"
+
+
+def award_text(rng, application):
+    act, _ = ACTS[rng.choice(len(ACTS), p=[share for _, share in ACTS])]
+    amount = _choice(rng, [20, 23, 26, 30, 33, 40, 46, 53, 60, 66, 80, 96, 100, 120, 240])
+    cents = _choice(rng, ['', '', '', ' 33 Cents', ' 66 Cents', ' ___ Cents', ' 00 Cents'])
+    frequency = 'per month' if act == 'March 18, 1818' and rng.rand() < 0.7 else 'per annum'
+    issued_day, issued_month, issued_year = _date(rng, 1818, 1855)
+    lines = [
+        f"{application['state']} {rng.randint(1, 40)}.{rng.randint(100, 999)}",
+        application['name'],
+        f"of {_choice(rng, COUNTIES)} in the State of {application['state']}",
+        f"who was a {application['rank']} in the Company commanded by Captain {_choice(rng, SURNAMES)}",
+        f"of the Regt. commanded by Col. {_choice(rng, SURNAMES)} in the {application['service_state']} line",
+        f"for {rng.randint(6, 60)} months",
+        f"Inscribed on the Roll of {application['state']}",
+        f"at the rate of {amount} Dollars{cents} {frequency},",
+        f"to commence on the 4th day of March, {act[-4:]}.",
+        f"Certificate of Pension issued the {_ordinal(issued_day)} day of {issued_month} {issued_year}",
+        f"and sent to {_choice(rng, FIRST_NAMES)} {_choice(rng, SURNAMES)} Esq.",
+        f"Arrears to the 4th of March {issued_year} ${rng.randint(20, 400)}.{rng.randint(0, 99):02d}",
+        f"Semi-anl. allowance ending 4 Sept. {issued_year} {amount / 2:.2f}",
+        f"{{Revolutionary Claim, Act {act}.}}",
+        f"Recorded by {_choice(rng, SURNAMES)} Clerk, Book {_choice(rng, 'ABCDE')} Vol. {rng.randint(1, 12)} Page {rng.randint(1, 200)}",
+    ]
+    if application['file_type'] == 'widow':
+        lines.insert(2, f"widow of {application['name']}")
+        lines[1] = application['widow']
+    return '\n'.join(lines)
+
+
+def declaration_text(rng, application):
+    day, month, year = _date(rng, 1818, 1840)
+    service_year = rng.randint(1775, 1782)
+    return (
+        f"State of {application['state']}\n{_choice(rng, COUNTIES)} County ss.\n"
+        f"On this {_ordinal(day)} day of {month} {year} personally appeared in open court before the Judges "
+        f"of the Court of Common Pleas now sitting {application['name']} a resident of the town of "
+        f"{_choice(rng, COUNTIES)} aged {rng.randint(58, 96)} years who being first duly sworn according to law "
+        f"doth on his oath make the following declaration in order to obtain the benefit of the act of Congress "
+        f"passed June 7, 1832. That he entered the service of the United States in the year {service_year} under "
+        f"Captain {_choice(rng, SURNAMES)} and served as a {application['rank']} in the {application['service_state']} "
+        f"line for the term of {rng.randint(3, 36)} months. That in the year {service_year + 1} he was at the battle "
+        f"of {_choice(rng, ['Saratoga', 'Monmouth', 'White Plains', 'Brandywine', 'Yorktown', 'Bunker Hill'])}. "
+        f"He hereby relinquishes every claim whatever to a pension or annuity except the present and declares "
+        f"that his name is not on the pension roll of the agency of any state.\n"
+        f"Sworn to and subscribed the day and year aforesaid.\n{application['name']}\n"
+        f"{_choice(rng, FIRST_NAMES)} {_choice(rng, SURNAMES)} Clerk"
+    )
+
+
+def widow_declaration_text(rng, application):
+    married_day, married_month, married_year = _date(rng, 1776, 1800)
+    died_day, died_month, died_year = _date(rng, 1820, 1845)
+    day, month, year = _date(rng, died_year, died_year + 10)
+    return (
+        f"State of {application['state']}\n{_choice(rng, COUNTIES)} County\n"
+        f"On this {_ordinal(day)} day of {month} {year} personally appeared {application['widow']} a resident of "
+        f"{_choice(rng, COUNTIES)} aged {rng.randint(60, 95)} years who being first duly sworn doth on her oath "
+        f"make the following declaration in order to obtain the benefit of the provision made by the act of "
+        f"Congress passed July 7, 1838 granting half pay and pensions to certain widows. That she is the widow "
+        f"of {application['name']} who was a {application['rank']} in the army of the Revolution. "
+        f"She further declares that she was married to the said {application['name']} on the {_ordinal(married_day)} "
+        f"day of {married_month} {married_year} and that her husband the aforesaid {application['name']} died on "
+        f"the {_ordinal(died_day)} day of {died_month} {died_year} and that she has remained a widow ever since "
+        f"that period.\n{application['widow']} her X mark"
+    )
+
+
+def letter_text(rng, application):
+    day, month, year = _date(rng, 1850, 1935)
+    return (
+        f"Department of the Interior,\nBureau of Pensions,\nWashington, D.C. {month} {day}, {year}.\n"
+        f"{_choice(rng, ['Sir', 'Madam', 'Dear Sir'])}:\nIn reply to your request for a statement of the military "
+        f"history of {application['name']}, a soldier of the Revolutionary War, you will find below the "
+        f"desired information as contained in his application for pension on file in this Bureau.\n"
+        f"Dates of enlistment: {rng.randint(1775, 1782)}. Length of service: {rng.randint(3, 36)} months. "
+        f"Rank: {application['rank']}. Officers under whom service was rendered: Captain {_choice(rng, SURNAMES)}, "
+        f"Colonel {_choice(rng, SURNAMES)}. State: {application['service_state']}.\n"
+        f"Residence at date of application: {_choice(rng, COUNTIES)}, {application['state']}.\n"
+        f"Very respectfully,\n{_choice(rng, FIRST_NAMES)} {_choice(rng, SURNAMES)}\nCommissioner."
+    )
+
+
+def brief_text(rng, application):
+    return (
+        f"BRIEF objections to the admission of Pension Claim of {application['name']} of "
+        f"{application['state']}.\n{application['token'] or ''} {application.get('number', '')}\n"
+        f"I. Does the applicant's declaration show the length of service? {_choice(rng, ['Yes', 'No', 'It does'])}\n"
+        f"II. Has the applicant obtained the evidence of a clergyman? {_choice(rng, ['Yes', 'No'])}\n"
+        f"XI. Has the applicant obtained the evidence of any officer or soldier? {_choice(rng, ['Yes', 'No'])}\n"
+        f"Admitted {_ordinal(rng.randint(1, 28))} {_choice(rng, MONTHS)} {rng.randint(1818, 1840)}"
+    )
+
+
+def cover_text(rng, application):
+    first = application['name'].split()[0]
+    return '\n'.join([application['abbr'].rstrip('.'), application['name'].split()[-1], first[:rng.randint(2, 4)],
+                      f"{(application['token'] or 'S.').split()[0].rstrip('.')}{application.get('number', '')}"])
+
+
+def fragment_text(rng, application):
+    words = declaration_text(rng, application).split()
+    start = rng.randint(0, max(1, len(words) - 20))
+    return ' '.join(words[start:start + rng.randint(5, 40)])
+
+
+PAGE_TEXT = {
+    'cover': cover_text,
+    'award': award_text,
+    'declaration': declaration_text,
+    'widow_declaration': widow_declaration_text,
+    'letter': letter_text,
+    'brief': brief_text,
+    'fragment': fragment_text,
+}
+
+
+def ocr_noise(rng, text, rate=0.02):
+    """Letter confusions, dropped characters, split words and stray marks at roughly `rate` per character."""
+    chars = list(text)
+    positions = np.flatnonzero(rng.rand(len(chars)) < rate)
+    operations = rng.randint(0, 5, size=len(positions))
+    for position, operation in zip(positions, operations):
+        char = chars[position]
+        if operation <= 1 and char in OCR_CONFUSIONS:
+            chars[position] = OCR_CONFUSIONS[char]
+        elif operation == 2:
+            chars[position] = ''
+        elif operation == 3 and char == ' ':
+            chars[position] = '\n'
+        elif operation == 4 and char.isalpha():
+            chars[position] = char + _choice(rng, ['.', ',', "'", ' ', '-\n'])
+    return ''.join(chars)
+
+
+def make_application(rng, index):
+    state, abbr, _ = STATES[rng.choice(len(STATES), p=_STATE_P)]
+    file_type, token, _ = FILE_TYPES[rng.choice(len(FILE_TYPES), p=_FILE_TYPE_P)]
+    application = {
+        'naid': 500_000_000 + index * (MAX_PAGES + 1),
+        'file_type': file_type,
+        'token': token,
+        'number': rng.randint(1, 40000),
+        'name': f"{_choice(rng, FIRST_NAMES)} {_choice(rng, SURNAMES)}",
+        'widow': f"{_choice(rng, WIDOW_NAMES)} {_choice(rng, SURNAMES)}",
+        'state': state,
+        'abbr': abbr,
+        'service_state': _choice(rng, STATES)[0],
+        'rank': _choice(rng, RANKS),
+    }
+    application['title'] = make_title(rng, application)
+    application['pages'] = int(min(MAX_PAGES, rng.geometric(1 / MEAN_PAGES)))
+    return application
+
+
+_STATE_P = np.array([weight for _, _, weight in STATES], dtype=float) / sum(weight for _, _, weight in STATES)
+_FILE_TYPE_P = np.array([weight for _, _, weight in FILE_TYPES], dtype=float) / sum(w for _, _, w in FILE_TYPES)
+
+
+def page_text(rng, application):
+    """One page's clean text: one section, or 2-3 '||'-joined sections."""
+    weights = list(PAGE_WEIGHTS)
+    if application['file_type'] == 'widow':
+        weights[PAGE_KINDS.index('widow_declaration')] *= 3
+    sections = 1 if rng.rand() < 0.9 else rng.randint(2, 4)
+    return ' || '.join(PAGE_TEXT[_choice(rng, PAGE_KINDS, weights)](rng, application) for _ in range(sections))
+
+
+def generate_chunk(seed, first_application, applications, noise_rate=0.02, transcribed_share=0.08):
+    """pyarrow Table of the pages of applications first_application .. first_application + applications - 1."""
+    columns = {name: [] for name in SCHEMA.names}
+    for index in range(first_application, first_application + applications):
+        rng = np.random.RandomState([seed, index])
+        application = make_application(rng, index)
+        naid = application['naid']
+        reel = rng.randint(1, 2671)
+        for page in range(application['pages']):
+            page_object_id = naid + page + 1
+            clean = page_text(rng, application)
+            transcribed = rng.rand() < transcribed_share
+            columns['NAID'].append(str(naid))
+            columns['naraURL'].append(f'https://catalog.archives.gov/id/{naid}')
+            columns['title'].append(application['title'])
+            columns['logicalDate'].append(None)
+            columns['variantControlNumbers'].append('[{"number": "Fold3 2018", "type": "Search Identifier"}]')
+            columns['pdfObjectID'].append(None)
+            columns['pdfURL'].append(None)
+            columns['pageObjectId'].append(str(page_object_id))
+            columns['pageURL'].append(
+                'https://s3.amazonaws.com/NARAprodstorage/lz/microfilm-publications/M804-RevolutionaryWarPensionAppFiles/'
+                f'0002/export_M804-RevolutionaryWarPensionAppFiles_{reel}_{naid % 10000}/images/{4150000 + reel}_{page:05d}.jpg')
+            columns['pageImageType'].append('Image (JPG)')
+            has_ocr = rng.rand() > 0.04
+            columns['ocrID'].append(str(page_object_id - 480_000_000) if has_ocr else None)
+            columns['ocrText'].append(ocr_noise(rng, clean, noise_rate) if has_ocr else None)
+            columns['ocrUploadDate'].append('2024-11-20T20:32:03.000Z' if has_ocr else None)
+            columns['ocrContributor'].append('FamilySearch' if has_ocr else None)
+            columns['transcriptionID'].append('%032x' % rng.randint(0, 2 ** 62) if transcribed else None)
+            columns['transcriptionText'].append(clean if transcribed else None)
+            columns['transcriptionContributionCount'].append(int(rng.randint(1, 6)) if transcribed else None)
+            columns['transcriptionUserNames'].append(json.dumps([f'volunteer{rng.randint(1, 5000)}']) if transcribed else None)
+            columns['transcriptionDate'].append(f'2024-{rng.randint(1, 13):02d}-{rng.randint(1, 29):02d}' if transcribed else None)
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def group_by_naid(table, separator='||'):
+    """Notebook 1's grouping: metadata columns dropped, unique values per NAID '||'-joined, sorted by title."""
+    df = table.drop_columns(METADATA_COLUMNS).to_pandas()
+    grouped = df.groupby('NAID', sort=False).agg(lambda x: separator.join(x.dropna().astype(str).unique())).reset_index()
+    return grouped.sort_values(by='title', kind='stable')
+
+
+def _generate_chunk_args(args):
+    return generate_chunk(*args)
+
+
+def generate_corpus(output, applications, seed=42, chunk_size=500, workers=None, grouped_output=None,
+                    noise_rate=0.02):
+    """Stream the corpus to output (and the grouped table to grouped_output). Returns (applications, pages)."""
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    chunks = [(seed, start, min(chunk_size, applications - start), noise_rate)
+              for start in range(0, applications, chunk_size)]
+    pages = 0
+    grouped_writer = None
+    with pq.ParquetWriter(output, SCHEMA) as writer:
+        for table in map_chunks(_generate_chunk_args, chunks, workers=workers):
+            writer.write_table(table)
+            pages += table.num_rows
+            if grouped_output:
+                grouped = pa.Table.from_pandas(group_by_naid(table), preserve_index=False)
+                if grouped_writer is None:
+                    grouped_writer = pq.ParquetWriter(grouped_output, grouped.schema)
+                grouped_writer.write_table(grouped)
+            print(f"  {pages:,} pages written...", end='\r')
+    if grouped_writer is not None:
+        grouped_writer.close()
+    return applications, pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a synthetic nara_pension_file_pages.parquet')
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--applications', type=int, help='number of applications (NAIDs)')
+    size.add_argument('--scale', type=float, help=f'multiple of the real corpus ({CORPUS_APPLICATIONS:,} applications)')
+    parser.add_argument('--output', default='synthetic/nara_pension_file_pages.parquet')
+    parser.add_argument('--grouped', action='store_true', help='also write df_grouped_NAID_sorted_title.parquet next to it'
+                        ' (sorted by title within each chunk only, not across the whole file)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=500, help='applications per chunk')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--noise', type=float, default=0.02, help='OCR noise rate per character')
+    args = parser.parse_args()
+
+    applications = args.applications or int(round((args.scale or 0.01) * CORPUS_APPLICATIONS))
+    grouped_output = (os.path.join(os.path.dirname(args.output), 'df_grouped_NAID_sorted_title.parquet')
+                      if args.grouped else None)
+    print(f"Generating {applications:,} applications (seed {args.seed})...")
+    start = time.time()
+    _, pages = generate_corpus(args.output, applications, seed=args.seed, chunk_size=args.chunk_size,
+                               workers=args.workers, grouped_output=grouped_output, noise_rate=args.noise)
+    print(f"\n✓ {pages:,} pages in {time.time() - start:.1f}s - saved to {args.output}")
+    if grouped_output:
+        print(f"✓ Grouped table saved to {grouped_output}")
@@ -0,0 +1,97 @@
+"""
+Join LLM extraction results back onto the filtered pension amounts subset.
+
+Replaces the merge in join_original_1000_sample.ipynb, which cast pageObjectId / NAID to str on
+both frames, merged, and then needed drop_duplicates on five columns because repeated pages
+fanned the merge out. Here the keys are converted to int64 once, repeated keys are dropped on
+each side before the merge (keeping the first row, as the old drop_duplicates did), and the
+merge runs with validate='one_to_one' so any remaining fan-out is an error rather than extra
+rows. The LLM dicts are written to parquet as a struct column (EXTRACTION_TYPE).
+
+Usage:
+    python join_llm_results.py
+    python join_llm_results.py --llm extracted_amounts_llm.jsonl --output filtered_pension_amounts_subset_with_llm.parquet
+"""
+
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from llm_runner import EXTRACTION_FIELDS
+
+KEYS = ['pageObjectId', 'NAID']
+LLM_COLUMN = 'llm_extracted_pension_amount'
+
+EXTRACTION_TYPE = pa.struct([(field, pa.string()) for field in EXTRACTION_FIELDS])
+
+
+def normalize_keys(df, keys=KEYS):
+    """Key columns as int64 (NAIDs / pageObjectIds are numeric ids, stored as str or int depending on the source)."""
+    df = df.copy()
+    for key in keys:
+        df[key] = pd.to_numeric(df[key], errors='raise').astype('int64')
+    return df
+
+
+def drop_duplicate_keys(df, keys=KEYS, name='table'):
+    """Keep the first row for each key; prints how many repeated rows were dropped."""
+    duplicated = df.duplicated(subset=keys)
+    if duplicated.any():
+        print(f"  {name}: dropping {duplicated.sum()} rows with repeated {'/'.join(keys)}")
+    return df[~duplicated]
+
+
+def read_llm_results(path):
+    """LLM results from the sample JSON (a list) or llm_runner JSONL output, with the dict column renamed."""
+    if path.endswith('.jsonl'):
+        df = pd.read_json(path, lines=True, dtype=False)
+    else:
+        df = pd.read_json(path, dtype=False)
+    df = df.rename(columns={'extracted_pension_amount': LLM_COLUMN})
+    df['llm_extracted_pension_amount_dollars'] = True
+    return df
+
+
+def join_llm_results(pages, llm, keys=KEYS):
+    """Left join of the LLM columns onto pages, one row per page key."""
+    pages = drop_duplicate_keys(normalize_keys(pages, keys), keys, 'pages')
+    llm = drop_duplicate_keys(normalize_keys(llm, keys), keys, 'LLM results')
+    llm_columns = [col for col in llm.columns if col not in pages.columns or col in keys]
+    return pages.merge(llm[llm_columns], on=keys, how='left', validate='one_to_one')
+
+
+def extraction_array(values):
+    """LLM dicts as a pyarrow struct array; pages without a result are null, values are kept as strings."""
+    rows = [{field: None if value.get(field) is None else str(value.get(field)) for field in EXTRACTION_FIELDS}
+            if isinstance(value, dict) else None for value in values]
+    return pa.array(rows, type=EXTRACTION_TYPE)
+
+
+def write_joined(df, path):
+    """Parquet with LLM_COLUMN as a struct column (pandas would otherwise infer it from dicts and NaN)."""
+    table = pa.Table.from_pandas(df.drop(columns=[LLM_COLUMN]), preserve_index=False)
+    position = list(df.columns).index(LLM_COLUMN)
+    table = table.add_column(position, LLM_COLUMN, extraction_array(df[LLM_COLUMN]))
+    pq.write_table(table, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Join LLM extraction results onto the filtered amounts subset')
+    parser.add_argument('--pages', default='../filtered_pension_amounts_subset.parquet')
+    parser.add_argument('--llm', default='extracted_amounts_sample_1000_without_text.json',
+                        help='sample JSON or llm_runner .jsonl output')
+    parser.add_argument('--output', default='filtered_pension_amounts_subset_with_llm_1000.parquet')
+    args = parser.parse_args()
+
+    pages = pd.read_parquet(args.pages)
+    llm = read_llm_results(args.llm)
+    print(f"Joining {len(llm)} LLM results onto {len(pages)} pages...")
+
+    joined = join_llm_results(pages, llm)
+    write_joined(joined, args.output)
+
+    print(f"  rows: {len(joined)}")
+    print(f"  with LLM results: {joined['llm_extracted_pension_amount_dollars'].eq(True).sum()}")
+    print(f"\n✓ Saved to {args.output}")
@@ -0,0 +1,325 @@
+"""
+LLM extraction runner for the filtered pension amounts subset.
+
+Reads filtered_pension_amounts_subset.parquet (columns NAID, naraURL, title, pageObjectId,
+pageURL, file_cat, priority_text - see filter_for_amounts.ipynb), sends each page's text to
+an LLM backend and appends one JSON line per page to the output file, in the same shape as
+extracted_amounts_sample_1000_without_text.json (page columns + extracted_pension_amount), plus
+extraction_source = 'llm' (see pre_extract_router.py).
+
+- requests run concurrently with asyncio (a fixed number of worker tasks), with an optional
+  requests-per-minute limit
+- responses are cached in SQLite by (prompt version, pageObjectId, text hash), so re-runs and
+  larger runs never pay twice for the same page + prompt
+- failed requests are retried with exponential backoff; pages that still fail are not
+  written and are picked up again by the next run
+- results are written as they finish, and pages already in the output file are skipped, so an
+  interrupted run resumes where it stopped
+
+Backends: 'stub' (offline, regex based - for testing the runner) and 'gemini' (google-genai,
+GEMINI_API_KEY).
+
+Usage:
+    python llm_runner.py --input ../filtered_pension_amounts_subset.parquet --limit 1000
+    python llm_runner.py --backend stub --limit 50 --output stub_run.jsonl
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../..'))
+from pension_pipeline.jsonl import truncate_partial_line  # noqa: E402
+
+PROMPT_VERSION = 'pension_amount_v1'
+
+PAGE_COLUMNS = ['NAID', 'naraURL', 'title', 'pageObjectId', 'pageURL', 'file_cat']
+
+EXTRACTION_FIELDS = [
+    'applicant_name',
+    'applicant_type',
+    'place',
+    'pension_amount',
+    'pension_frequency',
+    'pension_act',
+    'soldier_rank',
+    'issued_date',
+    'allowance_start_date',
+    'document_type',
+]
+
+EXTRACTION_PROMPT = """You are reading one page of a Revolutionary War pension application file (OCR or transcription text).
+Extract the pension allowance details and answer with a single JSON object with exactly these keys:
+
+  applicant_name: name of the pensioner (string or null)
+  applicant_type: "soldier", "widow" or "unknown"
+  place: state or place the pension is paid in (string or null)
+  pension_amount: amount of the pension as written, digits only (string or null)
+  pension_frequency: payment frequency as written, e.g. "per annum", "per month" (string or null)
+  pension_act: date of the act the pension was granted under, MM/DD/YYYY (string or null)
+  soldier_rank: rank of the soldier (string or null)
+  issued_date: date the certificate was issued, MM/DD/YYYY (string or null)
+  allowance_start_date: date the allowance commences, MM/DD/YYYY (string or null)
+  document_type: "award_roll_card", "application_affidavit", "administrative_letter" or "unknown"
+
+Use null for anything that is not on the page. Do not add any other text.
+
+Page text:
+{text}
+"""
+
+JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def parse_response(raw):
+    """The JSON object in a model response (code fences / extra text around it are ignored)."""
+    match = JSON_OBJECT.search(raw or '')
+    if not match:
+        raise ValueError(f"No JSON object in response: {(raw or '')[:200]!r}")
+    result = json.loads(match.group(0))
+    if not isinstance(result, dict):
+        raise ValueError("Response is not a JSON object")
+    return {field: result.get(field) for field in EXTRACTION_FIELDS}
+
+
+class ResponseCache:
+    """SQLite cache of parsed responses keyed by (prompt version, pageObjectId, text hash)."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' prompt_version TEXT NOT NULL,'
+            ' page_object_id TEXT NOT NULL,'
+            ' text_hash TEXT NOT NULL,'
+            ' response TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' PRIMARY KEY (prompt_version, page_object_id, text_hash))'
+        )
+        self.connection.commit()
+
+    def get(self, prompt_version, page_object_id, digest):
+        row = self.connection.execute(
+            'SELECT response FROM responses WHERE prompt_version = ? AND page_object_id = ? AND text_hash = ?',
+            (prompt_version, page_object_id, digest),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, prompt_version, page_object_id, digest, response):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+            (prompt_version, page_object_id, digest, json.dumps(response), time.time()),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+class RateLimiter:
+    """Spaces request starts at least 60 / requests_per_minute seconds apart."""
+
+    def __init__(self, requests_per_minute=None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class StubBackend:
+    """
+    Offline backend: answers from a few regexes instead of a model, with optional latency and
+    random failures, so the runner (concurrency, cache, retries, resume) can be tested locally.
+    """
+
+    AMOUNT = re.compile(r'(\d+)\s*(?:dollars|\$)|\$\s*(\d+)', re.IGNORECASE)
+    FREQUENCY = re.compile(r'per\s+(?:annum|month|ann)', re.IGNORECASE)
+    WIDOW = re.compile(r'\bwidow\b', re.IGNORECASE)
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    async def generate(self, prompt):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError("Stub backend failure")
+        text = prompt.split('Page text:\n', 1)[-1]
+        amount = self.AMOUNT.search(text)
+        frequency = self.FREQUENCY.search(text)
+        response = {field: None for field in EXTRACTION_FIELDS}
+        response.update({
+            'applicant_type': 'widow' if self.WIDOW.search(text) else 'unknown',
+            'pension_amount': (amount.group(1) or amount.group(2)) if amount else None,
+            'pension_frequency': frequency.group(0).lower() if frequency else None,
+            'document_type': 'unknown',
+        })
+        return json.dumps(response)
+
+
+class GeminiBackend:
+    """google-genai async client (pip install google-genai), JSON response mode."""
+
+    def __init__(self, model='gemini-2.0-flash', api_key=None):
+        try:
+            from google import genai
+        except ImportError as e:
+            raise ImportError("The gemini backend needs google-genai: pip install google-genai") from e
+        self.client = genai.Client(api_key=api_key or os.environ.get('GEMINI_API_KEY'))
+        self.model = model
+
+    async def generate(self, prompt):
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config={'response_mime_type': 'application/json', 'temperature': 0},
+        )
+        return response.text
+
+
+def load_records(path, text_col='priority_text', limit=None):
+    """Page records (dicts) from the filtered subset parquet / JSON, pages without text dropped."""
+    import pandas as pd  # only needed here; the runner and router start without it
+
+    df = pd.read_json(path, dtype=False) if path.endswith('.json') else pd.read_parquet(path)
+    df = df[df[text_col].notna() & df[text_col].astype(str).str.strip().ne('')]
+    if limit:
+        df = df.head(limit)
+    df = df.astype({'NAID': str, 'pageObjectId': str})
+    return df[[col for col in PAGE_COLUMNS if col in df.columns] + [text_col]].to_dict('records')
+
+
+def completed_page_ids(path):
+    """pageObjectIds already written to the output JSONL (a partial last line is ignored)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)['pageObjectId']))
+            except (json.JSONDecodeError, KeyError):
+                continue
+    return done
+
+
+async def extract_page(record, text, backend, cache, limiter, max_retries, prompt_version, stats):
+    """Cached response for one page, calling the backend (with retries) on a cache miss."""
+    page_object_id = record['pageObjectId']
+    digest = text_hash(text)
+    cached = cache.get(prompt_version, page_object_id, digest)
+    if cached is not None:
+        stats['cached'] += 1
+        return cached
+
+    prompt = EXTRACTION_PROMPT.format(text=text)
+    for attempt in range(max_retries + 1):
+        try:
+            await limiter.wait()
+            response = parse_response(await backend.generate(prompt))
+        except Exception as e:
+            if attempt == max_retries:
+                print(f"  failed {page_object_id}: {e}")
+                return None
+            stats['retries'] += 1
+            await asyncio.sleep(min(30, 2 ** attempt) * (0.5 + random.random()))
+            continue
+        cache.put(prompt_version, page_object_id, digest, response)
+        stats['called'] += 1
+        return response
+
+
+async def run_extraction(records, backend, output_path, cache_path, concurrency=8, max_retries=3,
+                         requests_per_minute=None, prompt_version=PROMPT_VERSION, text_col='priority_text'):
+    """
+    Extract every record not already in output_path and append the results as JSON lines.
+    Returns counts of cached / called / failed / skipped pages.
+    """
+    # a crash can leave half a line at the end; cut it off so the next record starts on its own line
+    truncate_partial_line(output_path)
+    done = completed_page_ids(output_path)
+    pending = [record for record in records if str(record['pageObjectId']) not in done]
+    stats = {'total': len(records), 'skipped': len(records) - len(pending),
+             'cached': 0, 'called': 0, 'retries': 0, 'failed': 0}
+
+    cache = ResponseCache(cache_path)
+    limiter = RateLimiter(requests_per_minute)
+    queue = asyncio.Queue()
+    for record in pending:
+        queue.put_nowait(record)
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+        async def worker():
+            while True:
+                try:
+                    record = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                text = str(record[text_col])
+                response = await extract_page(record, text, backend, cache, limiter,
+                                              max_retries, prompt_version, stats)
+                if response is None:
+                    stats['failed'] += 1
+                    continue
+                result = {col: record[col] for col in PAGE_COLUMNS if col in record}
+                result['extracted_pension_amount'] = response
+                result['extraction_source'] = 'llm'
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                out.flush()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            cache.close()
+
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run LLM pension extraction over the filtered amounts subset')
+    parser.add_argument('--input', default='../filtered_pension_amounts_subset.parquet')
+    parser.add_argument('--output', default='extracted_amounts_llm.jsonl')
+    parser.add_argument('--cache', default='llm_responses.sqlite')
+    parser.add_argument('--backend', choices=['gemini', 'stub'], default='gemini')
+    parser.add_argument('--model', default='gemini-2.0-flash')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=None, help='max requests per minute')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--limit', type=int, default=None, help='only the first N pages')
+    args = parser.parse_args()
+
+    backend = GeminiBackend(args.model) if args.backend == 'gemini' else StubBackend()
+    records = load_records(args.input, limit=args.limit)
+    print(f"Extracting {len(records)} pages with the {args.backend} backend (prompt {PROMPT_VERSION})...")
+
+    start = time.time()
+    stats = asyncio.run(run_extraction(records, backend, args.output, args.cache, concurrency=args.concurrency,
+                                       max_retries=args.retries, requests_per_minute=args.rpm))
+    print(f"\n✓ Done in {time.time() - start:.1f}s - results in {args.output}")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+    attempted = stats['total'] - stats['skipped']
+    if attempted:
+        print(f"  Percent success: {(attempted - stats['failed']) / attempted * 100:.1f}%")
@@ -0,0 +1,201 @@
+"""
+Confidence-gated routing between the deterministic extractor and the LLM runner.
+
+Allowance pages that follow the printed award roll template ("Inscribed on the Roll of X at
+the rate of N Dollars per annum ... Certificate of Pension issued the ...") are already read
+correctly by extract_pension_info_v4 (pension_pipeline/extract_all_samples_v3.py). Every page goes through
+it first, and its result is accepted only when:
+
+- pension amount, frequency and place were all found
+- the amount and frequency match the page's single "at the rate of N Dollars per annum/month"
+  phrase, with no cents (the extractor reads "53 Dollars 33 Cents" as 53)
+- normalize_pension_frequency gives annual / monthly / semi-annual (not 'unknown')
+- normalize_place gives one of the standard states in state_mapping
+- the yearly amount is between MIN_YEARLY_AMOUNT and MAX_YEARLY_AMOUNT
+
+Accepted pages are written to the output JSONL in the llm_runner record shape, and only the
+remaining pages are sent to the LLM. Each record has extraction_source 'deterministic' or 'llm'.
+
+Usage:
+    python pre_extract_router.py --input ../filtered_pension_amounts_subset.parquet
+    python pre_extract_router.py --input extracted_amounts_sample_1000_with_text.json --route-only
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from llm_runner import EXTRACTION_FIELDS, PAGE_COLUMNS, GeminiBackend, StubBackend, completed_page_ids, \
+    load_records, run_extraction
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../..'))
+from pension_pipeline.extract_all_samples_v3 import extract_pension_info_v4  # noqa: E402
+from pension_pipeline.jsonl import truncate_partial_line  # noqa: E402
+from pension_pipeline.normalize_frequency import normalize_pension_frequency  # noqa: E402
+from pension_pipeline.normalize_state import normalize_place, state_mapping  # noqa: E402
+from pension_pipeline.normalize_yearly_amount import normalize_yearly_amount  # noqa: E402
+
+REQUIRED_FIELDS = ['pension_amount', 'pension_frequency', 'place']
+
+# yearly amounts outside this range are almost always a misread number (1st-99th percentile
+# of the 1000 page LLM sample is 8 - 589)
+MIN_YEARLY_AMOUNT = 8
+MAX_YEARLY_AMOUNT = 600
+
+STANDARD_STATES = set(state_mapping)
+
+RATE_PHRASE = re.compile(
+    r'rate of\s+(\d+(?:\.\d+)?)\s*(?:\$|Dollars)\s*(?:(\d+|_+)\s*Cents\s*)?(per annum|per month|per year)', re.I)
+WIDOW = re.compile(r'\bwidow\b', re.I)
+WHITESPACE = re.compile(r'\s+')
+
+
+def to_mm_dd_yyyy(date_str):
+    """'March 4, 1831' / 'Mar 4, 1831' -> '03/04/1831' (the LLM date format), None if it does not parse."""
+    if not date_str:
+        return None
+    for date_format in ('%B %d, %Y', '%b %d, %Y'):
+        try:
+            return datetime.strptime(date_str, date_format).strftime('%m/%d/%Y')
+        except ValueError:
+            continue
+    return None
+
+
+def deterministic_extraction(text):
+    """extract_pension_info_v4 result mapped onto the LLM fields (extracted_pension_amount)."""
+    extracted = extract_pension_info_v4(text)
+    amount = extracted['award_allowance_amount']
+    rank = extracted['service_info']['rank']
+    if WIDOW.search(text):
+        applicant_type = 'widow'
+    elif rank:
+        applicant_type = 'soldier'
+    else:
+        applicant_type = 'unknown'
+
+    result = {field: None for field in EXTRACTION_FIELDS}
+    result.update({
+        'applicant_name': extracted['applicant_name'],
+        'applicant_type': applicant_type,
+        'place': extracted['award_granted_place'],
+        'pension_amount': f'{amount:g}' if amount is not None else None,
+        'pension_frequency': extracted['payment_frequency'],
+        'pension_act': to_mm_dd_yyyy(extracted['act_date']),
+        'soldier_rank': rank,
+        'issued_date': to_mm_dd_yyyy(extracted['award_date_issued']),
+        'document_type': 'award_roll_card',
+    })
+    return result
+
+
+def rejection_reason(text, result):
+    """Why a deterministic result can't be trusted (the page goes to the LLM), or None to accept it."""
+    for field in REQUIRED_FIELDS:
+        if result[field] is None:
+            return f'missing {field}'
+
+    rates = RATE_PHRASE.findall(WHITESPACE.sub(' ', text))
+    if len(rates) != 1:
+        return 'no rate phrase' if not rates else 'several rate phrases'
+    amount, cents, per = rates[0]
+    if cents.strip('_') and int(cents) != 0:
+        return 'cents'
+
+    frequency = normalize_pension_frequency(result['pension_frequency'])
+    if frequency == 'unknown':
+        return 'unknown frequency'
+    if float(amount) != float(result['pension_amount']) or normalize_pension_frequency(per) != frequency:
+        return 'rate phrase mismatch'
+    if normalize_place(result['place']) not in STANDARD_STATES:
+        return 'non-standard place'
+    yearly_amount = normalize_yearly_amount(result['pension_amount'], frequency)
+    if yearly_amount is None or not MIN_YEARLY_AMOUNT <= yearly_amount <= MAX_YEARLY_AMOUNT:
+        return 'amount out of range'
+    return None
+
+
+def route_records(records, text_col='priority_text'):
+    """
+    Split records into deterministic results and pages for the LLM.
+    Returns (accepted [(record, result)], llm_records, Counter of rejection reasons).
+    """
+    accepted, llm_records, reasons = [], [], Counter()
+    for record in records:
+        text = str(record[text_col])
+        result = deterministic_extraction(text)
+        reason = rejection_reason(text, result)
+        if reason is None:
+            accepted.append((record, result))
+        else:
+            llm_records.append(record)
+            reasons[reason] += 1
+    return accepted, llm_records, reasons
+
+
+def write_deterministic(accepted, output_path):
+    """Append accepted results not already in output_path. Returns the number written."""
+    # same file the LLM runner appends to - drop a half-written last line before appending
+    truncate_partial_line(output_path)
+    done = completed_page_ids(output_path)
+    written = 0
+    with open(output_path, 'a', encoding='utf-8') as out:
+        for record, result in accepted:
+            if str(record['pageObjectId']) in done:
+                continue
+            row = {col: record[col] for col in PAGE_COLUMNS if col in record}
+            row['extracted_pension_amount'] = result
+            row['extraction_source'] = 'deterministic'
+            out.write(json.dumps(row, ensure_ascii=False) + '\n')
+            written += 1
+    return written
+
+
+def print_routing(total, accepted, reasons):
+    print(f"Routed {total} pages:")
+    if not total:
+        return
+    print(f"  deterministic: {accepted} ({accepted / total * 100:.1f}%)")
+    print(f"  LLM:           {total - accepted} ({(total - accepted) / total * 100:.1f}%)")
+    for reason, count in reasons.most_common():
+        print(f"    {reason}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Deterministic extraction first, LLM for the remaining pages')
+    parser.add_argument('--input', default='../filtered_pension_amounts_subset.parquet')
+    parser.add_argument('--output', default='extracted_amounts_llm.jsonl')
+    parser.add_argument('--cache', default='llm_responses.sqlite')
+    parser.add_argument('--backend', choices=['gemini', 'stub'], default='gemini')
+    parser.add_argument('--model', default='gemini-2.0-flash')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=None, help='max requests per minute')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--limit', type=int, default=None, help='only the first N pages')
+    parser.add_argument('--route-only', action='store_true', help='report the routing without writing or calling the LLM')
+    args = parser.parse_args()
+
+    records = load_records(args.input, limit=args.limit)
+    start = time.time()
+    accepted, llm_records, reasons = route_records(records)
+    print_routing(len(records), len(accepted), reasons)
+    print(f"  (routing took {time.time() - start:.1f}s)")
+    if args.route_only:
+        sys.exit(0)
+
+    written = write_deterministic(accepted, args.output)
+    print(f"\nWrote {written} deterministic results to {args.output}")
+
+    backend = GeminiBackend(args.model) if args.backend == 'gemini' else StubBackend()
+    print(f"Extracting {len(llm_records)} pages with the {args.backend} backend...")
+    stats = asyncio.run(run_extraction(llm_records, backend, args.output, args.cache, concurrency=args.concurrency,
+                                       max_retries=args.retries, requests_per_minute=args.rpm))
+    print(f"\n✓ Done in {time.time() - start:.1f}s - results in {args.output}")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,149 @@
+"""
+Per-category lemma counts from one pass over the page table.
+
+Rows are the file_cat labels written by set_application_categories ('widow',
+'bounty land warrant||widow', 'unknown', ...), columns are lemma ids, and the values are
+occurrence counts, stored as a scipy.sparse CSR matrix. A category's frequency distribution,
+a category-vs-rest comparison, distinctive words or a theme total is then a slice / sum of
+rows instead of another pass over the text.
+
+Saved as a single .npz file (CSR arrays + category labels + vocabulary).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from word_frequency import chunked, ensure_nltk_data, get_lemma_table, map_chunks, tokenize_page
+
+
+class CategoryCube:
+
+    def __init__(self, categories, vocab, matrix, page_counts):
+        """
+        categories: list of file_cat labels (row labels)
+        vocab: list of lemma strings (column labels)
+        matrix: (len(categories) x len(vocab)) scipy.sparse CSR matrix of counts
+        page_counts: int array, number of pages counted for each category
+        """
+        self.categories = list(categories)
+        self.category_index = {category: i for i, category in enumerate(self.categories)}
+        self.vocab = list(vocab)
+        self.vocab_index = {word: i for i, word in enumerate(self.vocab)}
+        self.matrix = matrix.tocsr()
+        self.page_counts = np.asarray(page_counts)
+
+    @staticmethod
+    def _factorize(page_categories):
+        codes, categories = pd.factorize(pd.Series(page_categories).fillna('').astype(str))
+        return codes, list(categories)
+
+    @classmethod
+    def from_token_store(cls, store, page_categories):
+        """Cube from an integer-coded TokenStore and one file_cat label per page."""
+        codes, categories = cls._factorize(page_categories)
+        rows = codes[store.page_of_value]
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, store.values)),
+                                   shape=(len(categories), len(store.vocab)))
+        matrix.sum_duplicates()
+        page_counts = np.bincount(codes[store.page_lengths > 0], minlength=len(categories))
+        return cls(categories, store.vocab, matrix, page_counts)
+
+    @classmethod
+    def from_texts(cls, texts, page_categories, lemma_table=None, workers=None, chunk_size=1000):
+        """
+        Cube straight from page texts (e.g. df_full['ocrText'], df_full['file_cat']): pages are
+        tokenized in worker processes as in streaming_freq_dist, lemmatized through the LemmaTable,
+        and each chunk's counts are added to the running matrix. Missing texts are skipped.
+        """
+        ensure_nltk_data()
+        if lemma_table is None:
+            lemma_table = get_lemma_table()
+        codes, categories = cls._factorize(page_categories)
+        labeled = ((code, text) for code, text in zip(codes, texts) if isinstance(text, str))
+
+        matrix = sparse.csr_matrix((len(categories), 0), dtype=np.int64)
+        page_counts = np.zeros(len(categories), dtype=np.int64)
+        for chunk_codes, token_lists in map_chunks(tokenize_labeled_chunk, chunked(labeled, chunk_size), workers=workers):
+            lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+            token_ids = lemma_table.encode([token for tokens in token_lists for token in tokens])
+            lemma_ids = lemma_table.lemma_ids[token_ids]
+            rows = np.repeat(np.asarray(chunk_codes, dtype=np.int64), lengths)
+            shape = (len(categories), len(lemma_table.lemmas))
+            chunk = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, lemma_ids)), shape=shape)
+            matrix.resize(shape)
+            matrix = matrix + chunk
+            page_counts += np.bincount(chunk_codes, minlength=len(categories))
+        matrix.resize((len(categories), len(lemma_table.lemmas)))
+        return cls(categories, lemma_table.lemmas, matrix, page_counts)
+
+    def save(self, path):
+        np.savez(path, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+                 shape=np.array(self.matrix.shape), page_counts=self.page_counts,
+                 categories=np.array(self.categories, dtype=str), vocab=np.array(self.vocab, dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        arrays = np.load(path)
+        matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(arrays['shape']))
+        return cls(arrays['categories'].tolist(), arrays['vocab'].tolist(), matrix, arrays['page_counts'])
+
+    def rows(self, category, contains=False):
+        """
+        Row numbers for a file_cat label. With contains=True, every label that includes the category
+        (case-insensitive) - the same rows as df['file_cat'].str.contains(category, case=False).
+        """
+        if contains:
+            return np.array([i for i, label in enumerate(self.categories) if category.lower() in label.lower()],
+                            dtype=np.int64)
+        return np.array([self.category_index[category]] if category in self.category_index else [], dtype=np.int64)
+
+    def counts(self, rows=None):
+        """Lemma counts summed over the given rows (all rows when None), as a dense int array."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return np.asarray(matrix.sum(axis=0)).ravel()
+
+    def rest_counts(self, rows):
+        """Lemma counts over every row not in rows (the 'rest' side of a category-vs-rest comparison)."""
+        return self.counts() - self.counts(rows)
+
+    def freq_dist(self, rows=None):
+        """
+        FreqDist over the given rows - same counts as streaming_freq_dist over those pages
+        (words with equal counts are ordered by first appearance in the whole table).
+        """
+        from nltk import FreqDist
+
+        counts = self.counts(rows)
+        nonzero = np.flatnonzero(counts)
+        return FreqDist({self.vocab[i]: int(counts[i]) for i in nonzero})
+
+    def distinctive_words(self, rows, k=50, min_count=5):
+        """
+        Words most over-represented in rows compared with the rest of the corpus, ranked by the
+        log ratio of their add-one smoothed relative frequencies. DataFrame with counts and score.
+        """
+        inside = self.counts(rows)
+        outside = self.counts() - inside
+        vocab_size = len(self.vocab)
+        score = (np.log((inside + 1) / (inside.sum() + vocab_size))
+                 - np.log((outside + 1) / (outside.sum() + vocab_size)))
+        candidates = np.flatnonzero(inside >= min_count)
+        top = candidates[np.argsort(-score[candidates], kind='stable')[:k]]
+        return pd.DataFrame({'word': [self.vocab[i] for i in top], 'count': inside[top],
+                             'rest_count': outside[top], 'score': score[top]})
+
+    def theme_totals(self, words):
+        """(categories x words) DataFrame of counts for a theme word list; unknown words are all zero."""
+        columns = [self.vocab_index.get(word) for word in words]
+        known = [i for i in columns if i is not None]
+        totals = np.zeros((len(self.categories), len(words)), dtype=np.int64)
+        if known:
+            positions = [j for j, i in enumerate(columns) if i is not None]
+            totals[:, positions] = self.matrix[:, known].toarray()
+        return pd.DataFrame(totals, index=self.categories, columns=list(words))
+
+
+def tokenize_labeled_chunk(labeled):
+    """Worker: (category codes, token lists) for one chunk of (code, text) pairs."""
+    return [code for code, _ in labeled], [tokenize_page(text) for _, text in labeled]
@@ -0,0 +1,151 @@
+"""
+On-disk inverted index over page lemmas.
+
+Built once from a TokenStore: for every lemma, the sorted array of page ids it appears on and
+the number of times it appears on each of those pages. Theme word lists, "pages mentioning
+any of these animal words" and per-category counts are then unions / intersections of a
+few posting lists instead of a scan over every page.
+
+Page ids are row positions in the TokenStore (and so in the DataFrame it was built from).
+Saved as <name>.parquet (one row per lemma: lemma, page_ids, term_freqs) and, when the store
+has key columns, <name>_pages.parquet with the page keys.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class InvertedIndex:
+
+    def __init__(self, vocab, offsets, page_ids, term_freqs, num_pages, keys=None):
+        """
+        vocab: list of lemma strings (position = lemma id, same ids as the TokenStore)
+        offsets: int64 array, postings of lemma i are page_ids[offsets[i]:offsets[i + 1]]
+        page_ids: int32 array of page ids, sorted within each lemma
+        term_freqs: int32 array, occurrences of the lemma on the matching page
+        num_pages: number of pages in the store the index was built from
+        keys: optional pyarrow Table of page key columns (e.g. NAID, pageURL)
+        """
+        self.vocab = list(vocab)
+        self.vocab_index = {word: i for i, word in enumerate(self.vocab)}
+        self.offsets = offsets
+        self.page_ids = page_ids
+        self.term_freqs = term_freqs
+        self.num_pages = num_pages
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.vocab)
+
+    @classmethod
+    def from_token_store(cls, store):
+        """One sort of (lemma id, page id) pairs gives every posting list and its term frequencies."""
+        num_pages = max(len(store), 1)
+        pairs = store.values.astype(np.int64) * num_pages + store.page_of_value
+        pairs, term_freqs = np.unique(pairs, return_counts=True)
+        lemma_ids = pairs // num_pages
+        offsets = np.zeros(len(store.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lemma_ids, minlength=len(store.vocab)), out=offsets[1:])
+        return cls(store.vocab, offsets, (pairs % num_pages).astype(np.int32), term_freqs.astype(np.int32),
+                   len(store), store.keys)
+
+    def save(self, path):
+        """Write <path> (lemma, page_ids, term_freqs) and, if there are page keys, the _pages.parquet file."""
+        offsets = pa.array(self.offsets.astype(np.int32))
+        table = pa.table({
+            'lemma': self.vocab,
+            'page_ids': pa.ListArray.from_arrays(offsets, pa.array(self.page_ids, type=pa.int32())),
+            'term_freqs': pa.ListArray.from_arrays(offsets, pa.array(self.term_freqs, type=pa.int32())),
+        })
+        table = table.replace_schema_metadata({'num_pages': str(self.num_pages)})
+        pq.write_table(table, path)
+        if self.keys is not None:
+            pq.write_table(self.keys, pages_path(path))
+
+    @classmethod
+    def load(cls, path):
+        table = pq.read_table(path)
+        num_pages = int(table.schema.metadata[b'num_pages'])
+        page_lists = table.column('page_ids').combine_chunks()
+        freq_lists = table.column('term_freqs').combine_chunks()
+        keys = pq.read_table(pages_path(path)) if os.path.exists(pages_path(path)) else None
+        return cls(table.column('lemma').to_pylist(),
+                   page_lists.offsets.to_numpy().astype(np.int64),
+                   page_lists.flatten().to_numpy(),
+                   freq_lists.flatten().to_numpy(),
+                   num_pages, keys)
+
+    def postings(self, word):
+        """(page_ids, term_freqs) for one lemma - empty arrays for unknown words."""
+        lemma_id = self.vocab_index.get(word)
+        if lemma_id is None:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.int32)
+        start, end = self.offsets[lemma_id], self.offsets[lemma_id + 1]
+        return self.page_ids[start:end], self.term_freqs[start:end]
+
+    def document_frequency(self, word):
+        """Number of pages the lemma appears on."""
+        return len(self.postings(word)[0])
+
+    def term_frequency(self, word):
+        """Total occurrences of the lemma across all pages."""
+        return int(self.postings(word)[1].sum())
+
+    def pages_any(self, words):
+        """Sorted page ids containing at least one of the words."""
+        lists = [self.postings(word)[0] for word in words]
+        if not lists:
+            return np.array([], dtype=np.int32)
+        return np.unique(np.concatenate(lists))
+
+    def pages_all(self, words):
+        """Sorted page ids containing every one of the words (shortest posting list first)."""
+        lists = sorted((self.postings(word)[0] for word in words), key=len)
+        if not lists:
+            return np.array([], dtype=np.int32)
+        pages = lists[0]
+        for page_ids in lists[1:]:
+            pages = np.intersect1d(pages, page_ids, assume_unique=True)
+        return pages
+
+    def page_mask(self, words, all_words=False):
+        """Boolean mask over pages (same as TokenStore.page_mask), e.g. df[index.page_mask(farm_animal_words)]."""
+        mask = np.zeros(self.num_pages, dtype=bool)
+        mask[self.pages_all(words) if all_words else self.pages_any(words)] = True
+        return mask
+
+    def theme_frequencies(self, words, page_mask=None):
+        """
+        [{'word', 'frequency'}] sorted by frequency - the layout of the widow_themes/*.json lists.
+        page_mask restricts the counts to a subset of pages.
+        """
+        frequencies = []
+        for word in words:
+            page_ids, term_freqs = self.postings(word)
+            if page_mask is not None:
+                term_freqs = term_freqs[page_mask[page_ids]]
+            frequencies.append({'word': word, 'frequency': int(term_freqs.sum())})
+        return sorted(frequencies, key=lambda x: x['frequency'], reverse=True)
+
+    def category_counts(self, words, page_categories):
+        """
+        Per-category counts for a word list. page_categories holds one label per page (e.g. the
+        file_cat column). Returns a DataFrame indexed by category with the number of pages that
+        mention any of the words and the total occurrences of the words.
+        """
+        page_categories = np.asarray(page_categories, dtype=object)
+        page_ids = np.concatenate([self.postings(word)[0] for word in words] or [np.array([], dtype=np.int32)])
+        term_freqs = np.concatenate([self.postings(word)[1] for word in words] or [np.array([], dtype=np.int32)])
+        occurrences = pd.Series(term_freqs, index=page_categories[page_ids]).groupby(level=0).sum()
+        pages = pd.Series(page_categories[self.pages_any(words)]).value_counts()
+        counts = pd.DataFrame({'pages': pages, 'occurrences': occurrences}).fillna(0).astype(np.int64)
+        return counts.sort_values('pages', ascending=False)
+
+
+def pages_path(path):
+    return path[:-len('.parquet')] + '_pages.parquet' if path.endswith('.parquet') else path + '_pages.parquet'
+
@@ -0,0 +1,225 @@
+"""
+Sharded bigram / trigram counts for the collocation cells of 3_frequency_count.ipynb.
+
+BigramCollocationFinder.from_words / TrigramCollocationFinder.from_words over the concatenated
+corpus keep every n-gram in memory in one process, and count n-grams that run across page
+(and || section) boundaries. Here each page is split on || and every section is tokenized and
+lemmatized on its own, so n-grams never span sections. Worker processes count chunks of pages
+and the per-chunk Counters are merged.
+
+With min_count > 1 and sketch=True, a first pass adds every n-gram to a count-min sketch (a
+small fixed-size table of counters), and the second pass only keeps n-grams whose sketch
+estimate is at least min_count. The sketch never underestimates, so the merged counts are
+exact for every n-gram that occurs at least min_count times (the same as apply_freq_filter),
+while memory is bounded by the number of frequent n-grams. Pages are tokenized once per pass.
+
+Sizing the sketch: every counter also collects the counts of the other n-grams hashed to it, on
+average N / width for N n-gram occurrences, so the sketch only prunes when N / width is well below
+min_count. A fixed width of 2**21 on the full corpus (N around 1e8) gives about 50 per counter and
+keeps nearly every n-gram. By default the width is sized from the input instead: the first chunk's
+n-gram count, scaled to the number of pages, estimates N, and the width is the power of two
+>= e * N / min_count (expected overcount below min_count / e), up to MAX_SKETCH_WIDTH. The
+expected overcount and the share of kept n-grams that turned out below min_count (false
+positives of the sketch) are printed.
+
+The counts are wrapped in the usual NLTK finders, so nbest / score_ngrams (raw_freq, pmi, ...)
+and the tie-breaking between equal scores are unchanged.
+"""
+
+import hashlib
+import math
+import os
+import shutil
+import tempfile
+from collections import Counter
+from functools import partial
+
+import numpy as np
+
+from word_frequency import chunked, ensure_nltk_data, iter_pages, lemmatize_page, map_chunks
+
+# Sketch loaded by each worker process for the pruning pass (path, CountMinSketch)
+_worker_sketch = (None, None)
+
+# Sketch width when the input size is unknown (texts without len()), and the largest automatic
+# width: 2**26 int32 counters per row, 1 GB at depth 4
+DEFAULT_SKETCH_WIDTH = 2 ** 21
+MAX_SKETCH_WIDTH = 2 ** 26
+
+
+class CountMinSketch:
+    """
+    depth rows of width counters. Each n-gram maps to one counter per row and its estimate is
+    the smallest of those counters, which is never below the true count.
+    """
+
+    def __init__(self, width=DEFAULT_SKETCH_WIDTH, depth=4, table=None):
+        self.table = np.zeros((depth, width), dtype=np.int32) if table is None else table
+
+    @property
+    def depth(self):
+        return self.table.shape[0]
+
+    @property
+    def width(self):
+        return self.table.shape[1]
+
+    def indexes(self, ngrams):
+        return hash_indexes(ngram_hashes(ngrams), self.width, self.depth)
+
+    def add(self, indexes, counts):
+        for row in range(self.depth):
+            np.add.at(self.table[row], indexes[row], counts)
+
+    def estimate(self, ngrams):
+        indexes = self.indexes(ngrams)
+        return self.table[np.arange(self.depth)[:, None], indexes].min(axis=0)
+
+    def save(self, path):
+        np.save(path, self.table)
+
+    @classmethod
+    def load(cls, path):
+        return cls(table=np.load(path, mmap_mode='r'))
+
+
+def ngram_hashes(ngrams):
+    """One stable 64-bit hash per n-gram, as a uint64 array."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b('\x1f'.join(ngram).encode('utf-8'), digest_size=8).digest(), 'little')
+         for ngram in ngrams),
+        dtype=np.uint64, count=len(ngrams))
+
+
+def hash_indexes(hashes, width, depth):
+    """(depth x len(hashes)) sketch counter positions for n-gram hashes."""
+    h1 = hashes & np.uint64(0xFFFFFFFF)
+    h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+    rows = np.arange(depth, dtype=np.uint64)[:, None]
+    return ((h1 + rows * h2) % np.uint64(width)).astype(np.int64)
+
+
+def page_sections(text):
+    """Lemma lists for each ||-separated section of a page (empty sections skipped)."""
+    sections = (lemmatize_page(section, split_sections=False) for section in text.split('||'))
+    return [words for words in sections if words]
+
+
+def count_chunk(texts, orders=(2, 3)):
+    """Worker: word Counter plus one Counter per n-gram order for one chunk of pages."""
+    word_counts = Counter()
+    ngram_counts = {n: Counter() for n in orders}
+    for text in texts:
+        for words in page_sections(text):
+            word_counts.update(words)
+            for n in orders:
+                ngram_counts[n].update(zip(*(words[i:] for i in range(n))))
+    return word_counts, ngram_counts
+
+
+def sketch_chunk(texts, orders=(2, 3)):
+    """Worker (first pass): hashes and counts of every n-gram in the chunk, plus the number of pages."""
+    _, ngram_counts = count_chunk(texts, orders)
+    ngrams = [ngram for n in orders for ngram in ngram_counts[n]]
+    counts = np.fromiter((ngram_counts[len(ngram)][ngram] for ngram in ngrams), dtype=np.int32, count=len(ngrams))
+    return ngram_hashes(ngrams), counts, len(texts)
+
+
+def sketch_width_for(ngram_total, min_count, max_width=MAX_SKETCH_WIDTH):
+    """Power of two >= e * ngram_total / min_count (see the module docstring), at most max_width."""
+    target = math.e * ngram_total / min_count
+    width = 2 ** max(10, math.ceil(math.log2(max(target, 1))))
+    if width > max_width:
+        print(f"Sketch width capped at {max_width:,} (e * N / min_count is {target:,.0f});"
+              f" more n-grams below min_count will be kept")
+        return max_width
+    return width
+
+
+def count_chunk_pruned(texts, orders=(2, 3), sketch_path=None, min_count=1):
+    """Worker (second pass): chunk counts, keeping only n-grams the sketch estimates at >= min_count."""
+    global _worker_sketch
+    if _worker_sketch[0] != sketch_path:
+        _worker_sketch = (sketch_path, CountMinSketch.load(sketch_path))
+    sketch = _worker_sketch[1]
+    word_counts, ngram_counts = count_chunk(texts, orders)
+    for n, counts in ngram_counts.items():
+        ngrams = list(counts)
+        keep = sketch.estimate(ngrams) >= min_count if ngrams else []
+        ngram_counts[n] = Counter({ngram: counts[ngram] for ngram, kept in zip(ngrams, keep) if kept})
+    return word_counts, ngram_counts
+
+
+def count_ngrams(texts, orders=(2, 3), workers=None, chunk_size=1000, min_count=1,
+                 sketch=False, sketch_width=None, sketch_depth=4):
+    """
+    Word and n-gram FreqDists over all pages in `texts` (e.g. df_widow['ocrText']).
+    Returns (word_fd, {n: ngram_fd}); n-grams seen fewer than min_count times are dropped.
+    With sketch=True texts is read twice, so it must be a Series / list rather than an iterator;
+    sketch_width=None sizes the sketch from the input (module docstring).
+    """
+    from nltk import FreqDist
+
+    ensure_nltk_data()
+    sketch_dir = None
+    worker = partial(count_chunk, orders=orders)
+
+    if sketch and min_count > 1:
+        count_min = None
+        ngram_total = 0
+        first_pass = partial(sketch_chunk, orders=orders)
+        for hashes, counts, pages in map_chunks(first_pass, chunked(iter_pages(texts), chunk_size), workers=workers):
+            if count_min is None:
+                width = sketch_width
+                if width is None and hasattr(texts, '__len__'):
+                    width = sketch_width_for(int(counts.sum()) * len(texts) / pages, min_count)
+                count_min = CountMinSketch(width or DEFAULT_SKETCH_WIDTH, sketch_depth)
+            count_min.add(hash_indexes(hashes, count_min.width, count_min.depth), counts)
+            ngram_total += int(counts.sum())
+        if count_min is None:
+            count_min = CountMinSketch(sketch_width or DEFAULT_SKETCH_WIDTH, sketch_depth)
+        print(f"Count-min sketch: {ngram_total:,} n-grams, {count_min.depth} x {count_min.width:,} counters,"
+              f" expected overcount {ngram_total / count_min.width:.2f} per counter (min_count {min_count})")
+        sketch_dir = tempfile.mkdtemp()
+        sketch_path = os.path.join(sketch_dir, 'ngram_sketch.npy')
+        count_min.save(sketch_path)
+        del count_min
+        worker = partial(count_chunk_pruned, orders=orders, sketch_path=sketch_path, min_count=min_count)
+
+    try:
+        word_counts = Counter()
+        ngram_counts = {n: Counter() for n in orders}
+        for shard_words, shard_ngrams in map_chunks(worker, chunked(iter_pages(texts), chunk_size), workers=workers):
+            word_counts.update(shard_words)
+            for n in orders:
+                ngram_counts[n].update(shard_ngrams[n])
+    finally:
+        if sketch_dir:
+            shutil.rmtree(sketch_dir, ignore_errors=True)
+
+    if sketch_dir:
+        kept = sum(len(counts) for counts in ngram_counts.values())
+        below = sum(1 for counts in ngram_counts.values() for count in counts.values() if count < min_count)
+        print(f"Sketch kept {kept:,} n-grams; {below:,} ({below / max(kept, 1):.1%}) were below min_count"
+              f" (false positives)")
+
+    ngram_fds = {
+        n: FreqDist({ngram: count for ngram, count in counts.items() if count >= min_count})
+        for n, counts in ngram_counts.items()
+    }
+    return FreqDist(word_counts), ngram_fds
+
+
+def collocation_finder(word_fd, ngram_fds, n):
+    """
+    NLTK finder over the merged counts (n = 2 or 3), used the same way as the from_words finders.
+    The trigram finder has no (w1, *, w3) counts, which raw_freq and pmi do not use.
+    """
+    from nltk import FreqDist
+    from nltk.collocations import BigramCollocationFinder, TrigramCollocationFinder
+
+    if n == 2:
+        return BigramCollocationFinder(word_fd, ngram_fds[2])
+    if n == 3:
+        return TrigramCollocationFinder(word_fd, ngram_fds.get(2, FreqDist()), FreqDist(), ngram_fds[3])
+    raise ValueError(f"No collocation finder for {n}-grams")
@@ -0,0 +1,54 @@
+"""
+Seeded sampling of extra pages from the same applications (NAIDs) as a filtered page set.
+
+Replaces the per-NAID loop in get_filtered_animals_csv.ipynb, which filtered the whole page
+table once per NAID. Here the candidate pages are found with one semi-join (isin), grouped by
+NAID with one stable sort, and every group is sampled at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def sample_sibling_pages(df_full, naids, k=3, exclude=None, random_state=42,
+                         exclude_col='pageURL', text_col='transcriptionText'):
+    """
+    Up to k pages per NAID from df_full, skipping pages whose exclude_col value is in exclude
+    and pages without text_col. Rows come back grouped in the order of naids.
+
+    Gives the same rows, in the same order, as looping over naids and calling
+    naid_rows.sample(n=min(k, len(naid_rows)), random_state=random_state) for each one:
+    a seeded DataFrame.sample draws RandomState(seed).permutation(group size)[:n], so one
+    permutation per distinct group size covers every group (groupby().sample would instead
+    draw all groups from a single RandomState and pick different rows).
+    """
+    naids = pd.unique(pd.Series(naids).dropna())
+
+    # semi-join: pages of the requested NAIDs that have text and are not excluded
+    candidates = df_full[df_full['NAID'].isin(naids)]
+    if text_col is not None:
+        candidates = candidates[candidates[text_col].notna() & candidates[text_col].ne('')]
+    if exclude is not None:
+        candidates = candidates[~candidates[exclude_col].isin(exclude)]
+
+    # group rows by NAID in the order of naids, keeping df_full order within each group
+    group = pd.Categorical(candidates['NAID'], categories=naids).codes
+    order = np.argsort(group, kind='stable')
+    group_ids, starts, sizes = np.unique(group[order], return_index=True, return_counts=True)
+
+    picked_group, picked_rank, picked_position = [], [], []
+    for size in np.unique(sizes):
+        n = min(k, size)
+        permutation = np.random.RandomState(random_state).permutation(size)[:n]
+        same_size = sizes == size
+        picked_group.append(np.repeat(group_ids[same_size], n))
+        picked_rank.append(np.tile(np.arange(n), same_size.sum()))
+        picked_position.append((starts[same_size][:, None] + permutation[None, :]).ravel())
+
+    if not picked_position:
+        return candidates.iloc[:0].reset_index(drop=True)
+    picked_group = np.concatenate(picked_group)
+    picked_rank = np.concatenate(picked_rank)
+    picked_position = np.concatenate(picked_position)
+    picked_position = picked_position[np.lexsort((picked_rank, picked_group))]
+    return candidates.iloc[order[picked_position]].reset_index(drop=True)
@@ -0,0 +1,131 @@
+"""
+Integer-coded store of page lemmas.
+
+Instead of '||'-joined lemmatizedWords strings, each page is a list<int32> of lemma ids
+into a vocabulary table. Frequency counts, word-list filters and co-occurrence counts are
+then integer operations on the flat id array, and words only match whole lemmas
+(searching for "cow" no longer matches "coward").
+
+Saved as two parquet files: <name>.parquet (key columns + lemma_ids) and
+<name>_vocab.parquet (id, lemma).
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class TokenStore:
+
+    def __init__(self, vocab, pages, keys=None):
+        """
+        vocab: list of lemma strings (position = lemma id)
+        pages: pyarrow ListArray of int32 lemma ids, one entry per page
+        keys: optional pyarrow Table of page key columns (e.g. NAID, pageURL), same length as pages
+        """
+        self.vocab = list(vocab)
+        self.pages = pages
+        self.keys = keys
+        self.vocab_index = {word: i for i, word in enumerate(self.vocab)}
+
+        # flat view: every lemma id in page order, plus the page each one belongs to
+        self.values = pages.flatten().to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+        self.page_lengths = np.diff(pages.offsets.to_numpy())
+        self.page_of_value = np.repeat(np.arange(len(pages), dtype=np.int64), self.page_lengths)
+
+    def __len__(self):
+        return len(self.pages)
+
+    @staticmethod
+    def _keys_table(keys):
+        if keys is None or isinstance(keys, pa.Table):
+            return keys
+        return pa.Table.from_pandas(pd.DataFrame(keys), preserve_index=False)
+
+    @classmethod
+    def from_id_lists(cls, vocab, id_lists, keys=None):
+        """Build from a vocabulary and one sequence of lemma ids per page."""
+        lengths = np.fromiter((len(ids) for ids in id_lists), dtype=np.int32, count=len(id_lists))
+        offsets = np.zeros(len(id_lists) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.concatenate([np.asarray(ids, dtype=np.int32) for ids in id_lists]) if len(id_lists) else np.array([], dtype=np.int32)
+        pages = pa.ListArray.from_arrays(pa.array(offsets), pa.array(values, type=pa.int32()))
+        return cls(vocab, pages, cls._keys_table(keys))
+
+    @classmethod
+    def from_lemmatized_words(cls, lemmatized_words, keys=None):
+        """Build from a '||'-joined lemmatizedWords column (missing / empty values become empty pages)."""
+        vocab_index = {}
+        id_lists = []
+        for text in lemmatized_words:
+            if not isinstance(text, str) or not text:
+                id_lists.append(())
+                continue
+            id_lists.append([vocab_index.setdefault(word, len(vocab_index)) for word in text.split('||')])
+        return cls.from_id_lists(list(vocab_index), id_lists, keys)
+
+    def save(self, path):
+        """Write <path> (keys + lemma_ids) and the matching _vocab.parquet file."""
+        table = self.keys if self.keys is not None else pa.table({})
+        table = table.append_column('lemma_ids', self.pages)
+        pq.write_table(table, path)
+        pq.write_table(pa.table({'id': pa.array(range(len(self.vocab)), type=pa.int32()), 'lemma': self.vocab}),
+                       vocab_path(path))
+
+    @classmethod
+    def load(cls, path):
+        table = pq.read_table(path)
+        vocab_table = pq.read_table(vocab_path(path)).sort_by('id')
+        pages = table.column('lemma_ids').combine_chunks()
+        keys = table.drop_columns(['lemma_ids'])
+        return cls(vocab_table.column('lemma').to_pylist(), pages, keys if keys.num_columns else None)
+
+    def ids(self, words):
+        """Lemma ids for the words that are in the vocabulary (unknown words are skipped)."""
+        return np.array([self.vocab_index[word] for word in words if word in self.vocab_index], dtype=np.int32)
+
+    def counts(self, page_mask=None):
+        """Occurrences of every lemma id (optionally only on pages where page_mask is True)."""
+        values = self.values if page_mask is None else self.values[page_mask[self.page_of_value]]
+        return np.bincount(values, minlength=len(self.vocab))
+
+    def frequency_dict(self, page_mask=None, min_count=1):
+        """{lemma: count} sorted by count, descending - same shape as the notebook's sorted freq dicts."""
+        counts = self.counts(page_mask)
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] >= min_count]
+        return {self.vocab[i]: int(counts[i]) for i in order}
+
+    def page_mask(self, words):
+        """Boolean mask of pages containing any of the words (exact lemma match)."""
+        hits = np.isin(self.values, self.ids(words))
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.page_of_value[hits]] = True
+        return mask
+
+    def presence(self, words):
+        """(pages x len(words)) boolean matrix - does page i contain words[j]."""
+        column_of_id = np.full(len(self.vocab), -1, dtype=np.int64)
+        for j, word in enumerate(words):
+            if word in self.vocab_index:
+                column_of_id[self.vocab_index[word]] = j
+        columns = column_of_id[self.values]
+        hits = columns >= 0
+        present = np.zeros((len(self), len(words)), dtype=bool)
+        present[self.page_of_value[hits], columns[hits]] = True
+        return present
+
+    def cooccurrence(self, words):
+        """DataFrame of how many pages contain both words (diagonal = pages containing the word)."""
+        present = self.presence(words).astype(np.int32)
+        return pd.DataFrame(present.T @ present, index=list(words), columns=list(words))
+
+    def to_lemmatized_words(self):
+        """Back to '||'-joined strings (e.g. for CSV exports)."""
+        vocab = self.vocab
+        return ['||'.join(vocab[i] for i in ids) for ids in self.pages.to_pylist()]
+
+
+def vocab_path(path):
+    return path[:-len('.parquet')] + '_vocab.parquet' if path.endswith('.parquet') else path + '_vocab.parquet'
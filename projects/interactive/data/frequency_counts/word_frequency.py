@@ -0,0 +1,268 @@
+"""
+Streaming word-frequency counts for the pension text corpus.
+
+Same steps as 3_frequency_count.ipynb (lowercase, word_tokenize, drop stop words and
+punctuation, lemmatize), but applied page by page instead of on one concatenated corpus
+string. Pages are counted in chunks by a process pool, each worker returns a Counter shard,
+and the shards are merged into a single FreqDist.
+
+Lemmatization goes through a LemmaTable, so each distinct token is lemmatized once
+(the vocabulary is far smaller than the number of token occurrences). nltk itself is imported
+on first use, so importing this module (in every worker process too) stays cheap.
+"""
+
+import os
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'wordnet': 'corpora/wordnet',
+}
+
+# Loaded once per process on first use
+_stop_words_with_punct = None
+_lemmatizer = None
+_word_tokenize = None
+_lemma_table = None
+
+
+def ensure_nltk_data():
+    """Download the NLTK corpora used here, only if they are not already installed."""
+    import nltk
+
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True)
+
+
+def get_stop_words_with_punct():
+    global _stop_words_with_punct
+    if _stop_words_with_punct is None:
+        from nltk.corpus import stopwords
+        _stop_words_with_punct = set(stopwords.words('english')).union(set(string.punctuation))
+    return _stop_words_with_punct
+
+
+def get_word_tokenize():
+    global _word_tokenize
+    if _word_tokenize is None:
+        from nltk.tokenize import word_tokenize
+        _word_tokenize = word_tokenize
+    return _word_tokenize
+
+
+def get_lemmatizer():
+    global _lemmatizer
+    if _lemmatizer is None:
+        from nltk.stem import WordNetLemmatizer
+        _lemmatizer = WordNetLemmatizer()
+    return _lemmatizer
+
+
+class LemmaTable:
+    """
+    Vocabulary -> lemma table. Each distinct token is lemmatized once and given an integer id,
+    and lemmas get their own ids, so token ids can be mapped to lemma ids in bulk with NumPy.
+    With a path, the table is loaded from / saved to a parquet file (columns token, lemma) so
+    later runs skip lemmatization for every token already seen.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.token_ids = {}
+        self.tokens = []
+        self.lemma_index = {}
+        self.lemmas = []
+        self._lemma_ids = []
+        self._lemma_id_array = None
+        self._saved_size = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _add(self, token, lemma):
+        lemma_id = self.lemma_index.get(lemma)
+        if lemma_id is None:
+            lemma_id = self.lemma_index[lemma] = len(self.lemmas)
+            self.lemmas.append(lemma)
+        token_id = self.token_ids[token] = len(self.tokens)
+        self.tokens.append(token)
+        self._lemma_ids.append(lemma_id)
+        self._lemma_id_array = None
+        return token_id
+
+    def token_id(self, token):
+        """Id for token, lemmatizing it the first time it is seen."""
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = self._add(token, get_lemmatizer().lemmatize(token))
+        return token_id
+
+    def encode(self, tokens):
+        """Token ids (int32 array) for a list of tokens."""
+        return np.fromiter((self.token_id(token) for token in tokens), dtype=np.int32, count=len(tokens))
+
+    @property
+    def lemma_ids(self):
+        """lemma_ids[token_id] -> lemma id, as an int32 array."""
+        if self._lemma_id_array is None:
+            self._lemma_id_array = np.asarray(self._lemma_ids, dtype=np.int32)
+        return self._lemma_id_array
+
+    def lemma(self, token):
+        return self.lemmas[self._lemma_ids[self.token_id(token)]]
+
+    def lemmatize(self, tokens):
+        """Lemmas for a list of tokens (same result as lemmatizing each one)."""
+        lemmas, lemma_ids = self.lemmas, self._lemma_ids
+        return [lemmas[lemma_ids[self.token_id(token)]] for token in tokens]
+
+    def lemma_counts(self, token_counts):
+        """Turn a Counter of tokens into a Counter of lemmas, lemmatizing each distinct token once."""
+        counts = Counter()
+        for token, count in token_counts.items():
+            counts[self.lemma(token)] += count
+        return counts
+
+    def load(self):
+        table = pq.read_table(self.path)
+        for token, lemma in zip(table.column('token').to_pylist(), table.column('lemma').to_pylist()):
+            self._add(token, lemma)
+        self._saved_size = len(self.tokens)
+
+    def save(self, path=None):
+        """Write the table to parquet (skipped when nothing new was added)."""
+        path = path or self.path
+        if path is None or (path == self.path and len(self.tokens) == self._saved_size):
+            return
+        lemmas = [self.lemmas[lemma_id] for lemma_id in self._lemma_ids]
+        pq.write_table(pa.table({'token': self.tokens, 'lemma': lemmas}), path)
+        if path == self.path:
+            self._saved_size = len(self.tokens)
+
+
+def get_lemma_table():
+    """Process-wide in-memory LemmaTable used by lemmatize_page."""
+    global _lemma_table
+    if _lemma_table is None:
+        _lemma_table = LemmaTable()
+    return _lemma_table
+
+
+def clean_page(text, split_sections=True):
+    """
+    Same cleaning as the notebook: drop newlines and lowercase.
+    split_sections also replaces the || separators (corpus-wide cells); get_lemmatized_words keeps them.
+    """
+    if split_sections:
+        text = text.replace('||', ' ')
+    return text.replace('\n', ' ').lower()
+
+
+def tokenize_page(text, split_sections=True):
+    """Tokenize one page and drop stop words and punctuation."""
+    stop_words_with_punct = get_stop_words_with_punct()
+    words = get_word_tokenize()(clean_page(text, split_sections))
+    return [word for word in words if word.casefold() not in stop_words_with_punct]
+
+
+def lemmatize_page(text, split_sections=True):
+    """Tokenize, filter and lemmatize one page."""
+    return get_lemma_table().lemmatize(tokenize_page(text, split_sections))
+
+
+def iter_pages(texts):
+    """Yield page texts as strings, skipping missing values (same as .dropna().astype(str))."""
+    for text in texts:
+        if text is None or text != text:  # None / NaN
+            continue
+        yield str(text)
+
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(func, chunks, workers=None):
+    """
+    Run func over chunks in a process pool, yielding results in order.
+    At most 2 * workers chunks are in flight, so memory stays bounded however long the input is.
+    """
+    if workers == 1:
+        yield from map(func, chunks)
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * workers
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def count_tokens(texts):
+    """Worker: surface token counts for one chunk of pages (lemmatized after merging)."""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize_page(text))
+    return counts
+
+
+def tokenize_chunk(texts):
+    """Worker: token lists for one chunk of pages, || separators kept (as in get_lemmatized_words)."""
+    return [tokenize_page(text, split_sections=False) if text else [] for text in texts]
+
+
+def streaming_freq_dist(texts, workers=None, chunk_size=1000, lemma_table=None):
+    """
+    FreqDist of lemmas over all pages in `texts` (e.g. df_widow['ocrText']), without building
+    the concatenated corpus string. Each worker counts chunk_size pages into its own Counter
+    of surface tokens; the shards are merged and every distinct token is lemmatized once.
+    """
+    from nltk import FreqDist
+
+    ensure_nltk_data()
+    if lemma_table is None:
+        lemma_table = get_lemma_table()
+    token_counts = Counter()
+    for shard in map_chunks(count_tokens, chunked(iter_pages(texts), chunk_size), workers=workers):
+        token_counts.update(shard)
+    return FreqDist(lemma_table.lemma_counts(token_counts))
+
+
+def lemmatized_words_column(texts, lemma_table=None, workers=None, chunk_size=1000):
+    """
+    Values for the lemmatizedWords column - same output as get_lemmatized_words in the notebook
+    ('||'-joined lemmas, '' for missing text). Pages are tokenized in worker processes and the
+    lemmas come from the LemmaTable, so lemmatization runs once per distinct token.
+    """
+    ensure_nltk_data()
+    if lemma_table is None:
+        lemma_table = get_lemma_table()
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    column = []
+    for token_lists in map_chunks(tokenize_chunk, chunked(texts, chunk_size), workers=workers):
+        column.extend('||'.join(lemma_table.lemmatize(tokens)) for tokens in token_lists)
+    return column
@@ -0,0 +1,368 @@
+"""
+Runs the data pipeline (notebooks and scripts) as a DAG of stages with cached outputs.
+
+Each stage declares the notebook / script it runs, the files it reads (inputs), the files it
+writes (outputs) and the helper modules it imports (code). Stage order comes from the files:
+a stage that reads another stage's output runs after it.
+
+A stage is skipped when its fingerprint - a hash of its input files, its notebook code cells /
+script, its code modules and its command - matches the last successful run and all its
+outputs exist. Inputs are hashed by content, so re-running an upstream stage that writes
+identical output does not invalidate the stages after it (hashes are cached by file size +
+modification time, so unchanged multi-GB parquet files are not re-read).
+
+Independent branches (frequency counting vs amount extraction) run in parallel, each stage in
+its own process. Wall time and peak RSS of every stage (including the notebook kernel it
+starts) are printed and kept in .pipeline/state.json; executed notebooks and script output
+are kept in .pipeline/runs.
+
+--profile runs the stages with the profiling hooks on (pension_pipeline/profiling.py, PENSION_PROFILE):
+per-function call counts, time, rows/s and peak memory of every stage are merged into
+.pipeline/runs/profile-<time>/profile.json, with profile.folded (collapsed stacks prefixed
+by the stage name) for a flame graph of the whole run.
+
+Notebooks are executed with nbconvert (pip install nbconvert ipykernel), in their own
+directory, so the relative paths inside them work unchanged.
+
+Usage:
+    python pipeline.py --list
+    python pipeline.py                       # everything that is out of date
+    python pipeline.py normalize --jobs 1    # normalize and the stages it depends on
+    python pipeline.py frequency --force     # re-run even if up to date
+    python pipeline.py --dry-run
+    python pipeline.py categorize --force --profile
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(PIPELINE_DIR, '.pipeline')
+STATE_PATH = os.path.join(STATE_DIR, 'state.json')
+RUNS_DIR = os.path.join(STATE_DIR, 'runs')
+
+QUANTITATIVE = '../../quantitative/data'
+PACKAGE = '../../pension_pipeline'
+
+sys.path.append(os.path.join(PIPELINE_DIR, '../..'))
+from pension_pipeline.profiling import merge_profiles, print_summary as print_profile  # noqa: E402
+
+
+class Stage:
+
+    def __init__(self, name, run, inputs=(), outputs=(), code=(), args=()):
+        """
+        name: stage name used on the command line
+        run: notebook (.ipynb) or script (.py) to execute, relative to this file
+        inputs / outputs: files read / written, relative to this file
+        code: helper modules the notebook / script imports, relative to this file
+        args: extra command line arguments for a script
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.code = list(code)
+        self.args = list(args)
+
+    @property
+    def is_notebook(self):
+        return self.run.endswith('.ipynb')
+
+    def command(self):
+        run_path = path_of(self.run)
+        if self.is_notebook:
+            return [sys.executable, '-m', 'nbconvert', '--to', 'notebook', '--execute', run_path,
+                    '--output-dir', RUNS_DIR, '--output', f'{self.name}.ipynb',
+                    '--ExecutePreprocessor.timeout=-1']
+        return [sys.executable, os.path.basename(run_path), *self.args]
+
+
+STAGES = [
+    Stage('group', f'{QUANTITATIVE}/1_fetch_and_group_original_data.ipynb',
+          inputs=[f'{QUANTITATIVE}/nara_pension_file_pages.parquet'],
+          outputs=[f'{QUANTITATIVE}/df_grouped_NAID_sorted_title.parquet']),
+    Stage('categorize', f'{QUANTITATIVE}/2_run_set_categories.ipynb',
+          inputs=[f'{QUANTITATIVE}/df_grouped_NAID_sorted_title.parquet'],
+          outputs=[f'{QUANTITATIVE}/df_grouped_NAID_sorted_title_categories.parquet'],
+          code=[f'{PACKAGE}/set_categories.py', f'{PACKAGE}/grouped_table.py', f'{PACKAGE}/profiling.py']),
+
+    # amount extraction branch
+    Stage('filter_amounts', 'filter_for_amounts.ipynb',
+          inputs=[f'{QUANTITATIVE}/nara_pension_file_pages.parquet',
+                  f'{QUANTITATIVE}/df_grouped_NAID_sorted_title_categories.parquet'],
+          outputs=['filtered_pension_amounts_subset.parquet']),
+    Stage('join_llm', 'extracted_LLM/join_original_1000_sample.ipynb',
+          inputs=['filtered_pension_amounts_subset.parquet',
+                  'extracted_LLM/extracted_amounts_sample_1000_without_text.json'],
+          outputs=['extracted_LLM/extracted_amounts_sample_1000_pre_normalization.csv',
+                   'extracted_LLM/filtered_pension_amounts_subset_with_llm_1000.parquet'],
+          code=['extracted_LLM/join_llm_results.py', 'extracted_LLM/llm_runner.py']),
+    Stage('normalize', 'extracted_LLM/normalize_extracted_llm.ipynb',
+          inputs=['extracted_LLM/extracted_amounts_sample_1000_pre_normalization.csv'],
+          outputs=['extracted_LLM/extracted_amounts_sample_1000_post_normalization.csv'],
+          code=[f'{PACKAGE}/normalize_frequency.py', f'{PACKAGE}/normalize_yearly_amount.py',
+                f'{PACKAGE}/normalize_pension_act_date.py', f'{PACKAGE}/normalize_state.py']),
+    Stage('aggregates', 'viz_data/export_aggregates.py',
+          inputs=['extracted_LLM/extracted_amounts_sample_1000_post_normalization.csv'],
+          outputs=['../public/data/aggregates/manifest.json'],
+          args=['--pension-data', '../extracted_LLM/extracted_amounts_sample_1000_post_normalization.csv']),
+
+    # frequency counting branch
+    Stage('frequency', 'frequency_counts/3_frequency_count.ipynb',
+          inputs=['frequency_counts/df_grouped_NAID_sorted_title_with_file_cat.parquet',
+                  'frequency_counts/nara_pension_file_pages_with_file_cat.parquet'],
+          outputs=['frequency_counts/widow_ungrouped_with_lemmatizedWords.parquet',
+                   'frequency_counts/widow_ungrouped_lemma_ids.parquet',
+                   'frequency_counts/widow_ungrouped_lemma_index.parquet',
+                   'frequency_counts/file_cat_lemma_counts.npz',
+                   'frequency_counts/widow_full_text_analysis_results.json',
+                   'frequency_counts/cats_text_analysis_results.json'],
+          code=['frequency_counts/word_frequency.py', 'frequency_counts/token_store.py',
+                'frequency_counts/inverted_index.py', 'frequency_counts/ngram_counts.py',
+                'frequency_counts/category_cube.py']),
+]
+
+
+def path_of(relative_path):
+    return os.path.normpath(os.path.join(PIPELINE_DIR, relative_path))
+
+
+class FileHasher:
+    """sha256 of file contents, cached by (size, mtime) in the pipeline state."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __call__(self, relative_path):
+        path = path_of(relative_path)
+        stat = os.stat(path)
+        cached = self.cache.get(path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.cache[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+
+def notebook_code_hash(relative_path):
+    """Hash of a notebook's code cells only, so saved outputs / execution counts don't invalidate it."""
+    with open(path_of(relative_path), 'r', encoding='utf-8') as f:
+        notebook = json.load(f)
+    sources = [''.join(cell['source']) for cell in notebook['cells'] if cell['cell_type'] == 'code']
+    return hashlib.sha256('\n\x00\n'.join(sources).encode('utf-8')).hexdigest()
+
+
+def stage_fingerprint(stage, hasher):
+    digest = hashlib.sha256(json.dumps([stage.name, stage.run, stage.args, stage.outputs]).encode())
+    digest.update((notebook_code_hash(stage.run) if stage.is_notebook else hasher(stage.run)).encode())
+    for relative_path in stage.code + stage.inputs:
+        digest.update(f'{relative_path}:{hasher(relative_path)}'.encode())
+    return digest.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_PATH):
+        return {'stages': {}, 'file_hashes': {}}
+    with open(STATE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def dependencies(stages):
+    """{stage name: names of the stages that write its inputs}"""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {stage.name: {producers[i] for i in stage.inputs if i in producers} for stage in stages}
+
+
+def select_stages(stages, targets):
+    """The target stages plus every stage they depend on (all stages when targets is empty)."""
+    if not targets:
+        return stages
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    deps = dependencies(stages)
+    selected, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(deps[name])
+    return [stage for stage in stages if stage.name in selected]
+
+
+def run_stage(stage, profile_dir=None):
+    """Run one stage in a subprocess. Returns (exit code, wall time in s, peak RSS in MB, log path)."""
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    log_path = os.path.join(RUNS_DIR, f'{stage.name}.log')
+    env = dict(os.environ)
+    if profile_dir:
+        env['PENSION_PROFILE'] = os.path.join(profile_dir, stage.name)
+    start = time.time()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(stage.command(), cwd=os.path.dirname(path_of(stage.run)),
+                                   stdout=log, stderr=subprocess.STDOUT, env=env)
+        # wait4 gives the rusage of this child, including the processes it waited for (the kernel)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss / (1024 * 1024) if sys.platform == 'darwin' else usage.ru_maxrss / 1024
+    return process.returncode, time.time() - start, peak_rss, log_path
+
+
+def run_pipeline(stages=STAGES, targets=(), jobs=2, force=False, dry_run=False, profile_dir=None):
+    """
+    Run the selected stages that are out of date, up to `jobs` at a time (with the profiling
+    hooks writing to profile_dir/<stage> when profile_dir is given).
+    Returns {stage name: status} with status 'up to date', 'ran', 'would run', 'failed',
+    'missing inputs' or 'skipped' (an upstream stage did not run).
+    """
+    stages = select_stages(stages, targets)
+    deps = dependencies(stages)
+    state = load_state()
+    hasher = FileHasher(state['file_hashes'])
+    status, running = {}, {}
+
+    def ready():
+        return [stage for stage in stages if stage.name not in status
+                and stage.name not in {name for name, _ in running.values()}
+                and all(status.get(dep) in ('up to date', 'ran', 'would run') for dep in deps[stage.name])]
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while True:
+            decided = len(status)
+            # upstream failures propagate
+            for stage in stages:
+                if stage.name not in status and any(status.get(dep) in ('failed', 'missing inputs', 'skipped')
+                                                    for dep in deps[stage.name]):
+                    status[stage.name] = 'skipped'
+                    print(f"  {stage.name}: skipped (an upstream stage did not run)")
+
+            for stage in ready():
+                if dry_run and any(status.get(dep) == 'would run' for dep in deps[stage.name]):
+                    status[stage.name] = 'would run'
+                    print(f"  {stage.name}: would run (after upstream stages)")
+                    continue
+                missing = [i for i in stage.inputs if not os.path.exists(path_of(i))]
+                if missing:
+                    status[stage.name] = 'missing inputs'
+                    print(f"  {stage.name}: missing inputs {', '.join(missing)}")
+                    continue
+                fingerprint = stage_fingerprint(stage, hasher)
+                previous = state['stages'].get(stage.name, {})
+                outputs_exist = all(os.path.exists(path_of(o)) for o in stage.outputs)
+                if not force and previous.get('fingerprint') == fingerprint and outputs_exist:
+                    status[stage.name] = 'up to date'
+                    print(f"  {stage.name}: up to date")
+                elif dry_run:
+                    status[stage.name] = 'would run'
+                    print(f"  {stage.name}: would run")
+                else:
+                    print(f"  {stage.name}: running {stage.run}")
+                    running[pool.submit(run_stage, stage, profile_dir)] = (stage.name, fingerprint)
+
+            if not running:
+                if all(stage.name in status for stage in stages):
+                    break
+                if len(status) == decided:
+                    raise RuntimeError("Stage dependencies form a cycle")
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                returncode, wall_time, peak_rss, log_path = future.result()
+                missing_outputs = [o for o in next(s for s in stages if s.name == name).outputs
+                                   if not os.path.exists(path_of(o))]
+                if returncode != 0 or missing_outputs:
+                    status[name] = 'failed'
+                    reason = f"exit code {returncode}" if returncode != 0 else f"missing {', '.join(missing_outputs)}"
+                    print(f"  {name}: failed ({reason}) after {wall_time:.1f}s - see {log_path}")
+                    continue
+                status[name] = 'ran'
+                state['stages'][name] = {'fingerprint': fingerprint, 'wall_time': round(wall_time, 2),
+                                         'peak_rss_mb': round(peak_rss, 1), 'finished_at': time.time(),
+                                         'log': log_path}
+                save_state(state)
+                print(f"  {name}: done in {wall_time:.1f}s, peak RSS {peak_rss:,.0f} MB")
+
+    save_state(state)
+    return status
+
+
+def collect_profiles(profile_dir):
+    """Merge the stage profiles of a run into profile_dir/profile.json and profile.folded; returns {stage: summary}."""
+    stages = {}
+    folded = []
+    for name in sorted(os.listdir(profile_dir)):
+        stage_dir = os.path.join(profile_dir, name)
+        if not os.path.isdir(stage_dir):
+            continue
+        stages[name] = merge_profiles(stage_dir)
+        with open(os.path.join(stage_dir, 'profile.folded'), 'r', encoding='utf-8') as f:
+            folded.extend(f"{name};{line}" for line in f)
+    with open(os.path.join(profile_dir, 'profile.json'), 'w', encoding='utf-8') as f:
+        json.dump({'stages': stages}, f, indent=2)
+    with open(os.path.join(profile_dir, 'profile.folded'), 'w', encoding='utf-8') as f:
+        f.writelines(folded)
+    return stages
+
+
+def print_summary(stages, status):
+    state = load_state()
+    print(f"\n{'stage':<16}{'status':<16}{'wall time':>12}{'peak RSS':>12}")
+    for stage in stages:
+        if stage.name not in status:
+            continue
+        recorded = state['stages'].get(stage.name, {})
+        wall_time = f"{recorded['wall_time']:.1f}s" if 'wall_time' in recorded else '-'
+        peak_rss = f"{recorded['peak_rss_mb']:,.0f} MB" if 'peak_rss_mb' in recorded else '-'
+        print(f"{stage.name:<16}{status[stage.name]:<16}{wall_time:>12}{peak_rss:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the out-of-date stages of the data pipeline')
+    parser.add_argument('stages', nargs='*', help='stages to bring up to date (default: all)')
+    parser.add_argument('--jobs', type=int, default=2, help='stages run in parallel')
+    parser.add_argument('--force', action='store_true', help='run the selected stages even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='only show what would run')
+    parser.add_argument('--list', action='store_true', help='list the stages and their dependencies')
+    parser.add_argument('--profile', action='store_true', help='record per-function profiles of the stages that run')
+    args = parser.parse_args()
+
+    if args.list:
+        deps = dependencies(STAGES)
+        for stage in STAGES:
+            after = f" (after {', '.join(sorted(deps[stage.name]))})" if deps[stage.name] else ''
+            print(f"{stage.name:<16}{stage.run}{after}")
+        sys.exit(0)
+
+    print("Running pipeline...")
+    start = time.time()
+    profile_dir = os.path.join(RUNS_DIR, time.strftime('profile-%Y%m%d-%H%M%S')) if args.profile else None
+    status = run_pipeline(targets=args.stages, jobs=args.jobs, force=args.force, dry_run=args.dry_run,
+                          profile_dir=profile_dir)
+    print_summary(STAGES, status)
+    if profile_dir and os.path.isdir(profile_dir):
+        for name, functions in collect_profiles(profile_dir).items():
+            print(f"\nProfile of {name}:")
+            print_profile(functions, limit=10)
+        print(f"\n✓ Profile saved to {os.path.join(profile_dir, 'profile.json')} (flame graph input: profile.folded)")
+    print(f"\n✓ Finished in {time.time() - start:.1f}s")
+    sys.exit(1 if any(s in ('failed', 'missing inputs', 'skipped') for s in status.values()) else 0)
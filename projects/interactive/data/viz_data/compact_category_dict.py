@@ -0,0 +1,104 @@
+"""
+Compact export of category_count_dict.json for the interactive app.
+
+category_count_dict.json stores each category's NAIDs (and the page count of each NAID) as
+one '||'-joined string, e.g. 37k NAIDs for 'soldier'. The compact file keeps the same keys
+per category, but:
+
+    NAIDs       sorted NAIDs, delta-encoded (first value, then differences), as little-endian
+                uint32 bytes in base64
+    page_count  page count of each NAID in the same (sorted) order, little-endian uint32 in base64
+
+count and avg_page_count are unchanged. The compact file is written to the interactive app's
+public/data and fetched on first use by loadCategoryNaids in interactive/src/utils.ts (which
+decodes it with decodeNaids / decodeUint32), so it is not bundled.
+
+The CategoriesBarChart components in quantitative/ and qualitative/ only read count and
+avg_page_count, so they import category_counts.json (category_counts below, written by the
+export cell of quantitative/data/viz_data/viz_categories.ipynb) without any NAIDs.
+"""
+
+import base64
+import gzip
+import json
+
+import numpy as np
+
+UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def encode_uint32(values):
+    """base64 of the values as little-endian uint32 bytes."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) and (values.min() < 0 or values.max() > UINT32_MAX):
+        raise ValueError("Values do not fit in uint32")
+    return base64.b64encode(values.astype('<u4').tobytes()).decode('ascii')
+
+
+def decode_uint32(text):
+    return np.frombuffer(base64.b64decode(text), dtype='<u4')
+
+
+def encode_naids(naids):
+    """Sorted, delta-encoded NAIDs as base64 uint32 - plus the sort order, to reorder aligned values."""
+    naids = np.asarray([int(naid) for naid in naids], dtype=np.int64)
+    order = np.argsort(naids, kind='stable')
+    return encode_uint32(np.diff(naids[order], prepend=0)), order
+
+
+def decode_naids(text):
+    return np.cumsum(decode_uint32(text), dtype=np.int64)
+
+
+def split_joined(value):
+    """'a||b||' -> ['a', 'b'] (the trailing '||' written by viz_categories.ipynb is dropped)."""
+    return [item for item in str(value).split('||') if item]
+
+
+def compact_category_count_dict(count_dict):
+    """Same categories and keys as category_count_dict.json, with NAIDs / page_count encoded."""
+    compact = {}
+    for category, entry in count_dict.items():
+        naids, order = encode_naids(split_joined(entry['NAIDs']))
+        compact[category] = {'count': entry['count'], 'NAIDs': naids}
+        if 'page_count' in entry:
+            page_counts = np.array([int(count) for count in split_joined(entry['page_count'])], dtype=np.int64)
+            compact[category]['page_count'] = encode_uint32(page_counts[order])
+        if 'avg_page_count' in entry:
+            compact[category]['avg_page_count'] = entry['avg_page_count']
+    return compact
+
+
+def category_counts(count_dict):
+    """Only count and avg_page_count per category - what the category bar charts read."""
+    return {
+        category: {key: entry[key] for key in ('count', 'avg_page_count') if key in entry}
+        for category, entry in count_dict.items()
+    }
+
+
+if __name__ == "__main__":
+    input_file = 'category_count_dict.json'
+    output_file = '../../public/data/category_count_dict_compact.json'
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        count_dict = json.load(f)
+
+    compact = compact_category_count_dict(count_dict)
+
+    # round trip check: same NAID set and the same page count for every NAID
+    for category, entry in count_dict.items():
+        original = dict(zip(map(int, split_joined(entry['NAIDs'])), map(int, split_joined(entry.get('page_count', '')))))
+        decoded = decode_naids(compact[category]['NAIDs'])
+        assert sorted(map(int, split_joined(entry['NAIDs']))) == decoded.tolist(), category
+        if 'page_count' in compact[category]:
+            assert original == dict(zip(decoded.tolist(), decode_uint32(compact[category]['page_count']).tolist())), category
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(compact, f, separators=(',', ':'))
+
+    for path in (input_file, output_file):
+        with open(path, 'rb') as f:
+            data = f.read()
+        print(f"{path}: {len(data) / 1024:,.0f} KB ({len(gzip.compress(data)) / 1024:,.0f} KB gzipped)")
+    print(f"\n✓ Saved to {output_file}")
@@ -0,0 +1,199 @@
+"""
+Precomputed aggregates for the interactive app.
+
+The averages the frontend charts show are computed here once, from the normalized extraction
+table, instead of in the browser from raw rows:
+
+    pension_amount_averages   yearly-amount averages overall, per act date, per act year and
+                              per applicant type (after the same IQR outlier filter as
+                              pension_amount_data.ts)
+
+Only aggregates the app reads are exported. The browser still works from rows where it needs
+them: the pension form's year / applicant type / place options (cross-filtered, and the result
+shows the matching row's page), the frequency themes (pages shown for each word), and
+CategoryBar reads the counts-only data-newest/category_count_dict.json.
+
+Artifacts are written to public/data/aggregates as <name>.<content hash>.json, and
+manifest.json maps each name to its current file. The manifest also records a fingerprint
+of the inputs (input files + this script); an artifact is only rebuilt when its fingerprint
+changes, and loadAggregate in src/aggregates.ts reads the manifest to find the file. Artifacts no
+longer in AGGREGATES are removed from the manifest and the output directory.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+
+import pandas as pd
+
+AGGREGATES_VERSION = 1
+
+DEFAULT_OUTPUT_DIR = '../../public/data/aggregates'
+DEFAULT_PENSION_DATA = '../../public/data/extracted_amounts_sample_1000_post_normalization.csv'
+
+
+def read_table(path):
+    """Parquet or CSV as strings, with empty cells as '' (the way d3.csv reads them)."""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+        return df.astype(object).where(df.notna(), '').astype(str)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def numeric_amount(value):
+    """normalized_yearly_amount as a float, or None when missing / not a finite number."""
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        amount = float(value)
+    except ValueError:
+        return None
+    return amount if math.isfinite(amount) else None
+
+
+def filter_outliers(df):
+    """Drop rows whose amount is outside Q1 - 1.5 IQR .. Q3 + 1.5 IQR (rows without an amount are kept)."""
+    amounts = df['normalized_yearly_amount'].map(numeric_amount)
+    valid = sorted(amount for amount in amounts if amount is not None)
+    if not valid:
+        return df
+    q1 = valid[math.floor(len(valid) * 0.25)]
+    q3 = valid[math.floor(len(valid) * 0.75)]
+    iqr = q3 - q1
+    keep = [amount is None or q1 - 1.5 * iqr <= amount <= q3 + 1.5 * iqr for amount in amounts]
+    return df[keep]
+
+
+def _averages(pairs):
+    """{key: mean} for (key, amount) pairs; sums in row order, as the frontend did."""
+    sums, counts = {}, {}
+    for key, amount in pairs:
+        sums[key] = sums.get(key, 0) + amount
+        counts[key] = counts.get(key, 0) + 1
+    return {key: sums[key] / counts[key] for key in sums}
+
+
+def pension_amount_averages(pension_df):
+    df = filter_outliers(pension_df)
+    rows = [(str(act_date).strip(), str(applicant_type).strip().lower(), numeric_amount(amount))
+            for act_date, applicant_type, amount in zip(df['known_act_date'], df['extracted_applicant_type'],
+                                                        df['normalized_yearly_amount'])]
+    rows = [row for row in rows if row[2] is not None]
+    amounts = [amount for _, _, amount in rows]
+    return {
+        'overall': sum(amounts) / len(amounts) if amounts else 0,
+        'by_act_date': _averages((act_date, amount) for act_date, _, amount in rows if act_date),
+        'by_year': _averages((act_date.split('-')[0], amount) for act_date, _, amount in rows
+                             if act_date and act_date.split('-')[0]),
+        'by_applicant_type': _averages((applicant_type, amount) for _, applicant_type, amount in rows
+                                       if applicant_type),
+        'count': len(rows),
+    }
+
+
+# artifact name -> (function, input argument name)
+AGGREGATES = {
+    'pension_amount_averages': (pension_amount_averages, 'pension_data'),
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def inputs_fingerprint(name, input_path):
+    """Hash of everything an artifact depends on: its input file, this script and the version."""
+    digest = hashlib.sha256(f'{name}:{AGGREGATES_VERSION}'.encode())
+    digest.update(file_sha256(input_path).encode())
+    digest.update(file_sha256(os.path.abspath(__file__)).encode())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, 'manifest.json')
+    if not os.path.exists(path):
+        return {'version': AGGREGATES_VERSION, 'artifacts': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_artifact(output_dir, name, payload, fingerprint, manifest):
+    """Write <name>.<hash>.json, point the manifest at it and remove the file it replaces."""
+    data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    content_hash = hashlib.sha256(data).hexdigest()
+    file_name = f'{name}.{content_hash[:10]}.json'
+    with open(os.path.join(output_dir, file_name), 'wb') as f:
+        f.write(data)
+
+    previous = manifest['artifacts'].get(name)
+    if previous and previous['file'] != file_name:
+        old_path = os.path.join(output_dir, previous['file'])
+        if os.path.exists(old_path):
+            os.remove(old_path)
+    manifest['artifacts'][name] = {'file': file_name, 'sha256': content_hash, 'inputs': fingerprint,
+                                   'bytes': len(data)}
+
+
+def export_aggregates(inputs, output_dir=DEFAULT_OUTPUT_DIR, force=False):
+    """
+    Rebuild every artifact whose inputs changed. inputs maps the input argument names
+    (pension_data) to file paths; missing files are skipped.
+    Returns the names of the artifacts that were rebuilt.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    manifest['version'] = AGGREGATES_VERSION
+    tables = {}
+    rebuilt = []
+
+    for name in [name for name in manifest['artifacts'] if name not in AGGREGATES]:
+        old_path = os.path.join(output_dir, manifest['artifacts'].pop(name)['file'])
+        if os.path.exists(old_path):
+            os.remove(old_path)
+        print(f"  {name}: removed (no longer exported)")
+
+    for name, (aggregate, input_name) in AGGREGATES.items():
+        path = inputs.get(input_name)
+        if not path or not os.path.exists(path):
+            print(f"  {name}: skipped ({input_name} not found: {path})")
+            continue
+
+        fingerprint = inputs_fingerprint(name, path)
+        current = manifest['artifacts'].get(name)
+        if (not force and current and current['inputs'] == fingerprint
+                and os.path.exists(os.path.join(output_dir, current['file']))):
+            print(f"  {name}: unchanged")
+            continue
+
+        if path not in tables:
+            tables[path] = read_table(path)
+        write_artifact(output_dir, name, aggregate(tables[path]), fingerprint, manifest)
+        rebuilt.append(name)
+        print(f"  {name}: wrote {manifest['artifacts'][name]['file']}")
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return rebuilt
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Precompute the aggregates shown by the interactive app')
+    parser.add_argument('--pension-data', default=DEFAULT_PENSION_DATA,
+                        help='normalized extraction table (.csv or .parquet)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--force', action='store_true', help='rebuild every artifact')
+    args = parser.parse_args()
+
+    print("Exporting aggregates...")
+    rebuilt = export_aggregates(
+        {'pension_data': args.pension_data},
+        output_dir=args.output_dir, force=args.force,
+    )
+    print(f"\n✓ {len(rebuilt)} artifact(s) rebuilt in {args.output_dir}")
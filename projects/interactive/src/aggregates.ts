@@ -0,0 +1,45 @@
+// Precomputed aggregates written by data/viz_data/export_aggregates.py.
+// manifest.json maps each aggregate name to its content-hashed file,
+// so a rebuild only changes the files whose data changed.
+
+const AGGREGATES_PATH = '/data/aggregates';
+
+interface AggregateManifest {
+  version: number;
+  artifacts: Record<string, { file: string; sha256: string }>;
+}
+
+export interface PensionAmountAverages {
+  overall: number;
+  by_act_date: Record<string, number>;
+  by_year: Record<string, number>;
+  by_applicant_type: Record<string, number>;
+  count: number;
+}
+
+export interface Aggregates {
+  pension_amount_averages: PensionAmountAverages;
+}
+
+let manifestPromise: Promise<AggregateManifest> | null = null;
+
+const getManifest = (): Promise<AggregateManifest> => {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${AGGREGATES_PATH}/manifest.json`).then(
+      response => response.json()
+    );
+  }
+  return manifestPromise;
+};
+
+export const loadAggregate = async <K extends keyof Aggregates>(
+  name: K
+): Promise<Aggregates[K]> => {
+  const manifest = await getManifest();
+  const entry = manifest.artifacts[name];
+  if (!entry) {
+    throw new Error(`Aggregate not exported: ${name}`);
+  }
+  const response = await fetch(`${AGGREGATES_PATH}/${entry.file}`);
+  return response.json();
+};
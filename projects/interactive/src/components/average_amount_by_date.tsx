@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import { getPensionAmountData } from '../pension_amount_data';
+import { loadAggregate } from '../aggregates';
 import { averageAmountByDateChartUtils, designUtils } from '../design_utils';
 
 type ExtraPoint = { year: string; amount: number };
@@ -18,32 +18,10 @@ export const AverageAmountByDate: React.FC<{ extraPoint?: ExtraPoint }> = ({
 
   useEffect(() => {
     const loadData = async () => {
-      const data = await getPensionAmountData();
-      // Compute overall average per YEAR from raw rows
-      const sums: Record<string, number> = {};
-      const counts: Record<string, number> = {};
-      data.forEach(row => {
-        const dateStr = (row['known_act_date'] || '').toString().trim();
-        if (!dateStr) return;
-        const year = dateStr.split('-')[0];
-        if (!year) return;
-        const amtStr = (row['normalized_yearly_amount'] || '')
-          .toString()
-          .trim();
-        if (!amtStr) return;
-        const amt = Number(amtStr);
-        if (!Number.isFinite(amt) || Number.isNaN(amt)) return;
-        if (!sums[year]) {
-          sums[year] = 0;
-          counts[year] = 0;
-        }
-        sums[year] += amt;
-        counts[year] += 1;
-      });
-      const byYear: Record<string, number> = {};
-      Object.keys(sums).forEach(y => {
-        byYear[y] = sums[y] / counts[y];
-      });
+      // Overall average per YEAR, precomputed by export_aggregates.py
+      const { by_year: byYear } = await loadAggregate(
+        'pension_amount_averages'
+      );
       setYearAverages(byYear);
     };
     loadData();
@@ -1,4 +1,5 @@
 import * as d3 from 'd3';
+import { loadAggregate } from './aggregates';
 
 export interface PensionDataRow {
   NAID: string;
@@ -320,16 +321,16 @@ export const getOverallAverage = (data: d3.DSVRowArray<string>): number => {
   return amounts.reduce((sum, val) => sum + val, 0) / amounts.length;
 };
 
-// Get all three averages at once
+// Get all three averages at once (precomputed by export_aggregates.py)
 export const getAllAverages = async (): Promise<{
   overall: number;
   byActDate: Record<string, number>;
   byApplicantType: Record<string, number>;
 }> => {
-  const data = await getPensionAmountData();
+  const averages = await loadAggregate('pension_amount_averages');
   return {
-    overall: getOverallAverage(data),
-    byActDate: getAverageByActDate(data),
-    byApplicantType: getAverageByApplicantType(data),
+    overall: averages.overall,
+    byActDate: averages.by_act_date,
+    byApplicantType: averages.by_applicant_type,
   };
 };
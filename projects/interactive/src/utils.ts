@@ -82,3 +82,84 @@ export function convertDollarsToToday(amount: number, year: string) {
 
 const CATEGORIES_KEYS = curatedCategoryDefinitions.map(cat => cat.key);
 export type CategoryKeyType = (typeof CATEGORIES_KEYS)[number];
+
+// Compact category_count_dict export (data/viz_data/compact_category_dict.py):
+// NAIDs are sorted and delta-encoded, page counts follow the same order,
+// both stored as little-endian uint32 bytes in base64. The file is served
+// from public/data and fetched on first use, so it is not in the bundle.
+export interface CompactCategoryEntry {
+  count: number;
+  NAIDs: string;
+  page_count?: string;
+  avg_page_count?: number;
+}
+
+export interface CategoryNaids {
+  count: number;
+  naids: Uint32Array;
+  pageCounts?: Uint32Array;
+  avgPageCount?: number;
+}
+
+export const decodeUint32 = (encoded: string): Uint32Array => {
+  const binary = atob(encoded);
+  const view = new DataView(new ArrayBuffer(binary.length));
+  for (let i = 0; i < binary.length; i++) {
+    view.setUint8(i, binary.charCodeAt(i));
+  }
+  const values = new Uint32Array(binary.length / 4);
+  for (let i = 0; i < values.length; i++) {
+    values[i] = view.getUint32(i * 4, true);
+  }
+  return values;
+};
+
+export const decodeNaids = (encoded: string): Uint32Array => {
+  const naids = decodeUint32(encoded);
+  for (let i = 1; i < naids.length; i++) {
+    naids[i] += naids[i - 1];
+  }
+  return naids;
+};
+
+export const decodeCategoryCountDict = (
+  data: Record<string, CompactCategoryEntry>
+): Record<string, CategoryNaids> =>
+  Object.fromEntries(
+    Object.entries(data).map(([category, entry]) => [
+      category,
+      {
+        count: entry.count,
+        naids: decodeNaids(entry.NAIDs),
+        pageCounts: entry.page_count ? decodeUint32(entry.page_count) : undefined,
+        avgPageCount: entry.avg_page_count,
+      },
+    ])
+  );
+
+// NAIDs are sorted, so membership is a binary search
+export const hasNaid = (naids: Uint32Array, naid: number): boolean => {
+  let low = 0;
+  let high = naids.length - 1;
+  while (low <= high) {
+    const mid = (low + high) >> 1;
+    if (naids[mid] === naid) return true;
+    if (naids[mid] < naid) low = mid + 1;
+    else high = mid - 1;
+  }
+  return false;
+};
+
+let categoryNaidsPromise: Promise<Record<string, CategoryNaids>> | null =
+  null;
+
+export const loadCategoryNaids = (): Promise<
+  Record<string, CategoryNaids>
+> => {
+  if (!categoryNaidsPromise) {
+    categoryNaidsPromise = fetch('/data/category_count_dict_compact.json')
+      .then(response => response.json())
+      .then(decodeCategoryCountDict);
+  }
+  return categoryNaidsPromise;
+};
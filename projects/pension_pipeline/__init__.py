@@ -0,0 +1,59 @@
+"""
+Shared pipeline code for the interactive, qualitative and quantitative projects.
+
+    set_categories          file_type / file_cat columns from NARA titles (run_categories)
+    non_llm_parsing         deterministic title / date parsing (process_deterministic_only)
+    clean_ocr_text          OCR text cleaning (clean_ocr_batch) and amount snippets
+    extract_all_samples_v3  rule-based allowance extraction (PensionInfoExtractor, parallel driver)
+    extract_diverse_samples diverse sample selection for prompt / rule development
+    test_extraction_v2      earlier version of the allowance extractor
+    normalize_*             normalizers for the LLM extraction fields
+    grouped_table           compact storage for the grouped NAID table (read_grouped / write_grouped)
+    profiling               opt-in profiling hooks (PENSION_PROFILE)
+    jsonl                   truncate_partial_line for the resumable JSON Lines result files
+    cli                     batch command line for the stages (python -m pension_pipeline <stage> ...)
+
+Notebooks add projects/ to sys.path and import from here, e.g.
+
+    import sys
+    sys.path.append('../../..')
+    from pension_pipeline.set_categories import run_categories
+
+The main functions are also available from the package itself (from pension_pipeline import
+run_categories); submodules are only imported when one of their names is first used, so
+importing the package does not load pandas, pyarrow or nltk. (normalize_yearly_amount is
+imported from its module, whose name it shares.)
+"""
+
+import importlib
+
+_EXPORTS = {
+    'run_categories': 'set_categories',
+    'category_dict': 'set_categories',
+    'read_grouped': 'grouped_table',
+    'write_grouped': 'grouped_table',
+    'with_urls': 'grouped_table',
+    'process_deterministic_only': 'non_llm_parsing',
+    'parse_title_deterministic': 'non_llm_parsing',
+    'extract_dates_from_text': 'non_llm_parsing',
+    'clean_ocr_batch': 'clean_ocr_text',
+    'clean_up_text_fast': 'clean_ocr_text',
+    'extract_amounts': 'clean_ocr_text',
+    'PensionInfoExtractor': 'extract_all_samples_v3',
+    'extract_pension_info_v4': 'extract_all_samples_v3',
+    'extract_samples_parallel': 'extract_all_samples_v3',
+    'iter_extract_chunks': 'extract_all_samples_v3',
+    'select_diverse_samples_fast': 'extract_diverse_samples',
+    'normalize_pension_frequency': 'normalize_frequency',
+    'get_known_act_date': 'normalize_pension_act_date',
+    'normalize_place': 'normalize_state',
+    'state_mapping': 'normalize_state',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 import re
-import pandas as pd
+
+from .profiling import first_len, profiled
 
 # Pre-compile regex patterns for better performance
 PATTERNS = {
@@ -42,12 +43,26 @@ PATTERNS = {
     'exclamation_spacing': re.compile(r'(\w)!(\w)')
 }
 
+
+def _isna(value):
+    """pd.isna for one value, without importing pandas for str / None / float values."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return False
+    if isinstance(value, float):
+        return value != value
+    import pandas as pd
+    return pd.isna(value)
+
+
+@profiled(rows=1)
 def clean_up_text_fast(text):
     """
     Optimized version of clean_up_text with pre-compiled regex patterns.
     Enhanced for Revolutionary War pension documents.
     """
-    if not text or pd.isna(text):
+    if not text or _isna(text):
         return ''
     
     text = str(text)
@@ -124,6 +139,7 @@ def clean_up_text_fast(text):
     return text.strip()
 
 
+@profiled(rows=first_len)
 def clean_ocr_batch(texts, progress_callback=None):
     """
     Clean a batch of OCR texts efficiently.
@@ -135,7 +151,7 @@ def clean_ocr_batch(texts, progress_callback=None):
     Returns:
         List of cleaned text strings
     """
-    if isinstance(texts, pd.Series):
+    if hasattr(texts, 'tolist'):  # pandas Series / NumPy array
         texts = texts.tolist()
     
     cleaned_texts = []
@@ -158,7 +174,7 @@ def clean_up_text_minimal(text):
     Minimal cleaning for maximum speed - only the most essential fixes.
     Use when processing very large datasets.
     """
-    if not text or pd.isna(text):
+    if not text or _isna(text):
         return ''
     
     text = str(text)
@@ -185,7 +201,7 @@ def clean_for_amounts(text):
     Minimal cleaning specifically optimized for extracting dollar amounts and acre amounts.
     Only fixes the most critical OCR errors that would break number recognition.
     """
-    if not text or pd.isna(text):
+    if not text or _isna(text):
         return ''
     
     text = str(text)
@@ -218,7 +234,7 @@ def extract_amounts(text):
     Extract dollar amounts and acre amounts from OCR text.
     Returns a dictionary with 'dollars' and 'acres' lists.
     """
-    if not text or pd.isna(text):
+    if not text or _isna(text):
         return {'dollars': [], 'acres': []}
     
     # Clean text minimally for amount extraction
@@ -0,0 +1,350 @@
+"""
+Command-line entry points for the pipeline stages, so they can be scheduled, launched in
+parallel and timed outside Jupyter. Each stage calls the same functions as its notebook.
+
+    group       page table -> one row per NAID, values joined with || (1_fetch_and_group_original_data)
+    categorize  grouped table -> + file_type, file_cat (run_categories), compact dtypes (grouped_table.py)
+    parse       page table -> + deterministic title / date columns (process_deterministic_only)
+    clean       + cleaned_text from --column (clean_ocr_batch)
+    extract     + dollars, acres from --column (extract_amounts)
+    normalize   LLM extraction table -> + normalized frequency / yearly amount / act date / place
+                (normalize_extracted_llm)
+    frequency   --column -> table of lemma, count (word_frequency.streaming_freq_dist)
+
+The input is read in --chunk-size row chunks (at most --limit rows); the chunks are processed
+by --workers processes and written to the output as they finish, so row-wise stages never hold
+the whole table in memory. group needs every page of a NAID together, so it reads the whole
+input and splits it into chunks of --chunk-size NAIDs. Input and output are parquet, or CSV
+when the path ends in .csv (the normalize notebook reads and writes CSV).
+
+A throughput summary (rows in / out, wall time, rows/s, output size, peak RSS) is printed at
+the end.
+
+Usage (from projects/):
+    python -m pension_pipeline group quantitative/data/nara_pension_file_pages.parquet grouped.parquet
+    python -m pension_pipeline categorize grouped.parquet categories.parquet --workers 8
+    python -m pension_pipeline parse pages.parquet parsed.parquet --limit 10000 --chunk-size 2000
+    python -m pension_pipeline clean pages.parquet cleaned.parquet --column ocrText
+    python -m pension_pipeline normalize pre_normalization.csv post_normalization.csv --workers 1
+    python -m pension_pipeline frequency widow_pages.parquet widow_counts.parquet --column ocrText
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+PROJECTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FREQUENCY_COUNTS_DIR = os.path.join(PROJECTS_DIR, 'interactive', 'data', 'frequency_counts')
+
+SEPARATOR = '||'
+# page metadata the grouped table does not keep (1_fetch_and_group_original_data.ipynb)
+GROUP_DROP_COLUMNS = ['transcriptionDate', 'transcriptionUserNames', 'transcriptionContributionCount',
+                      'transcriptionID', 'ocrID', 'ocrUploadDate', 'ocrContributor', 'variantControlNumbers']
+
+
+# ---------------------------------------------------------------------------
+# Stage functions - one chunk (DataFrame) in, one DataFrame out, run in the workers
+# ---------------------------------------------------------------------------
+
+def group_chunk(df):
+    """One row per NAID with the unique non-null values of every column joined with ||."""
+    df = df.drop(columns=[column for column in GROUP_DROP_COLUMNS if column in df.columns])
+    return df.groupby('NAID').agg(lambda x: SEPARATOR.join(x.dropna().astype(str).unique())).reset_index()
+
+
+def categorize_chunk(df):
+    from .grouped_table import compact_grouped
+    from .set_categories import run_categories
+
+    return compact_grouped(run_categories(df))
+
+
+def parse_chunk(df):
+    from .non_llm_parsing import process_deterministic_only
+
+    with contextlib.redirect_stdout(io.StringIO()):  # progress prints, once per chunk
+        return process_deterministic_only(df)
+
+
+def clean_chunk(df, column='ocrText', output_column='cleaned_text'):
+    from .clean_ocr_text import clean_ocr_batch
+
+    df[output_column] = clean_ocr_batch(df[column])
+    return df
+
+
+def extract_chunk(df, column='ocrText'):
+    from .clean_ocr_text import extract_amounts
+
+    amounts = [extract_amounts(text) for text in df[column].tolist()]
+    df['dollars'] = [result['dollars'] for result in amounts]
+    df['acres'] = [result['acres'] for result in amounts]
+    return df
+
+
+def _llm_fields(value):
+    """The LLM extraction dict of one row (stored as a dict or its repr in the CSV), or None."""
+    if isinstance(value, str):
+        return ast.literal_eval(value)
+    return value if isinstance(value, dict) else None
+
+
+def normalize_chunk(df, column='llm_extracted_pension_amount'):
+    """Same columns as normalize_extracted_llm.ipynb."""
+    from .normalize_frequency import normalize_pension_frequency
+    from .normalize_pension_act_date import get_known_act_date
+    from .normalize_state import normalize_place, state_mapping
+    from .normalize_yearly_amount import normalize_yearly_amount
+
+    fields = [_llm_fields(value) for value in df[column].tolist()]
+    frequencies = [normalize_pension_frequency(f.get('pension_frequency')) if f is not None else 'unknown'
+                   for f in fields]
+    places = [normalize_place(f.get('place')) if f is not None else None for f in fields]
+    df['normalized_payment_frequency'] = frequencies
+    df['normalized_yearly_amount'] = [normalize_yearly_amount(f.get('pension_amount'), frequency) if f is not None else None
+                                      for f, frequency in zip(fields, frequencies)]
+    df['known_act_date'] = [get_known_act_date(f.get('pension_act')) if f is not None else None for f in fields]
+    df['extracted_place'] = places
+    df['normalized_place'] = [place if place in state_mapping else None for place in places]
+    df['extracted_applicant_type'] = [f.get('applicant_type') if f is not None else None for f in fields]
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Reading, writing and the worker pool
+# ---------------------------------------------------------------------------
+
+def _is_csv(path):
+    return path.lower().endswith('.csv')
+
+
+def iter_input(path, chunk_size, limit=None, columns=None):
+    """Yield DataFrames of up to chunk_size rows from a parquet / CSV file, stopping after limit rows."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    remaining = limit
+    if _is_csv(path):
+        chunks = pd.read_csv(path, chunksize=chunk_size, nrows=limit, usecols=columns)
+    else:
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns)
+        chunks = (batch.to_pandas() for batch in batches)
+    for chunk in chunks:
+        if remaining is not None:
+            if remaining <= 0:
+                return
+            chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        yield chunk
+
+
+class OutputWriter:
+    """
+    Appends DataFrames to a parquet file (one row group per chunk) or a CSV file.
+    The parquet schema comes from the first chunk; columns that are all-null there are
+    written as strings so later chunks still fit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if _is_csv(self.path):
+            df.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        elif self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                for field in table.schema]).with_metadata(table.schema.metadata)
+            self._writer = pq.ParquetWriter(self.path, schema)
+            self._writer.write_table(table.cast(schema))
+        else:
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def map_chunks(function, chunks, workers=None):
+    """
+    Run function over chunks in a process pool, yielding results in order.
+    At most 2 * workers chunks are in flight, so memory stays bounded however long the input is.
+    """
+    if workers == 1:
+        yield from map(function, chunks)
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def naid_chunks(df, chunk_size):
+    """Split a page table into chunks of up to chunk_size NAIDs (all pages of a NAID in one chunk)."""
+    import pandas as pd
+
+    codes, _ = pd.factorize(df['NAID'], sort=True)
+    for _, chunk in df.groupby(codes // chunk_size, sort=True):
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Stage runners
+# ---------------------------------------------------------------------------
+
+def run_rowwise(function, args):
+    """Stream the input through function chunk by chunk; returns (rows in, rows out)."""
+    rows_in = 0
+
+    def chunks():
+        nonlocal rows_in
+        for chunk in iter_input(args.input, args.chunk_size, args.limit):
+            rows_in += len(chunk)
+            yield chunk
+
+    with OutputWriter(args.output) as writer:
+        for result in map_chunks(function, chunks(), args.workers):
+            writer.write(result)
+            print(f"  {writer.rows:,} rows written...", end='\r', flush=True)
+    print()
+    return rows_in, writer.rows
+
+
+def run_group(args):
+    import pandas as pd
+
+    df = pd.concat(list(iter_input(args.input, args.chunk_size, args.limit)), ignore_index=True)
+    grouped = pd.concat(list(map_chunks(group_chunk, naid_chunks(df, args.chunk_size), args.workers)),
+                        ignore_index=True)
+    grouped = grouped.sort_values(by='title')
+    with OutputWriter(args.output) as writer:
+        writer.write(grouped)
+    return len(df), len(grouped)
+
+
+def run_frequency(args):
+    import pandas as pd
+
+    if FREQUENCY_COUNTS_DIR not in sys.path:
+        sys.path.append(FREQUENCY_COUNTS_DIR)
+    from word_frequency import streaming_freq_dist
+
+    rows_in = 0
+
+    def texts():
+        nonlocal rows_in
+        for chunk in iter_input(args.input, args.chunk_size, args.limit, columns=[args.column]):
+            rows_in += len(chunk)
+            yield from chunk[args.column].tolist()
+
+    freq_dist = streaming_freq_dist(texts(), workers=args.workers, chunk_size=args.chunk_size)
+    counts = pd.DataFrame(freq_dist.most_common(), columns=['lemma', 'count'])
+    with OutputWriter(args.output) as writer:
+        writer.write(counts)
+    return rows_in, len(counts)
+
+
+STAGES = {
+    'group': 'group pages by NAID (one row per application, sorted by title)',
+    'categorize': 'add file_type / file_cat (run_categories)',
+    'parse': 'deterministic title and date parsing (process_deterministic_only)',
+    'clean': 'clean OCR text into cleaned_text (clean_ocr_batch)',
+    'extract': 'dollar and acre amounts (extract_amounts)',
+    'normalize': 'normalize the LLM-extracted pension fields',
+    'frequency': 'lemma frequency counts of a text column',
+}
+
+
+def run_stage(args):
+    """Run the stage named by args.stage; returns (rows in, rows out)."""
+    if args.stage == 'group':
+        return run_group(args)
+    if args.stage == 'frequency':
+        return run_frequency(args)
+    function = {
+        'categorize': categorize_chunk,
+        'parse': parse_chunk,
+        'clean': partial(clean_chunk, column=args.column or 'ocrText'),
+        'extract': partial(extract_chunk, column=args.column or 'ocrText'),
+        'normalize': partial(normalize_chunk, column=args.column or 'llm_extracted_pension_amount'),
+    }[args.stage]
+    return run_rowwise(function, args)
+
+
+def peak_rss_mb():
+    """Peak RSS of this process and of the (finished) worker processes, in MB."""
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+
+def print_throughput(stage, rows_in, rows_out, seconds, output, workers):
+    own, children = peak_rss_mb()
+    size = os.path.getsize(output) / (1024 * 1024) if os.path.exists(output) else 0
+    print(f"\nThroughput summary ({stage}):")
+    print(f"  rows in      {rows_in:>14,}")
+    print(f"  rows out     {rows_out:>14,}")
+    print(f"  wall time    {seconds:>14.2f} s")
+    print(f"  throughput   {rows_in / seconds if seconds else 0:>14,.0f} rows/s")
+    print(f"  workers      {workers or os.cpu_count():>14}")
+    print(f"  output       {size:>14,.1f} MB  {output}")
+    print(f"  peak RSS     {own:>14,.0f} MB  (largest worker {children:,.0f} MB)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m pension_pipeline',
+                                     description='Run a pipeline stage on a parquet / CSV file')
+    subparsers = parser.add_subparsers(dest='stage', required=True)
+    for stage, help_text in STAGES.items():
+        subparser = subparsers.add_parser(stage, help=help_text, description=help_text)
+        subparser.add_argument('input', help='input parquet (or .csv) file')
+        subparser.add_argument('output', help='output parquet (or .csv) file')
+        subparser.add_argument('--workers', type=int, default=None, help='worker processes (default: all CPUs)')
+        subparser.add_argument('--chunk-size', type=int, default=10000,
+                               help='rows per chunk (NAIDs per chunk for group)')
+        subparser.add_argument('--limit', type=int, default=None, help='only process the first N input rows')
+        if stage in ('clean', 'extract', 'normalize', 'frequency'):
+            default = 'llm_extracted_pension_amount' if stage == 'normalize' else 'ocrText'
+            subparser.add_argument('--column', default=default, help=f'input column (default: {default})')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not hasattr(args, 'column'):
+        args.column = None
+    print(f"Running {args.stage}: {args.input} -> {args.output}")
+    start = time.perf_counter()
+    rows_in, rows_out = run_stage(args)
+    print_throughput(args.stage, rows_in, rows_out, time.perf_counter() - start, args.output, args.workers)
+
+
+if __name__ == "__main__":
+    main()
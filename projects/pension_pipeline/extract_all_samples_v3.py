@@ -0,0 +1,438 @@
+import os
+import re
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+if __package__:
+    from .jsonl import truncate_partial_line
+else:  # run as a script: python extract_all_samples_v3.py
+    from jsonl import truncate_partial_line
+
+# Fields returned for every segment (service_info is nested)
+TOP_LEVEL_FIELDS = [
+    'award_allowance_amount', 'award_date_issued', 'applicant_name',
+    'soldier_name', 'act_date', 'payment_frequency', 'full_text', 'award_granted_place'
+]
+SERVICE_FIELDS = ['service_place', 'rank', 'company_commanded_by', 'line', 'service_duration']
+
+SERVICE_INFO_TYPE = pa.struct([(field, pa.string()) for field in SERVICE_FIELDS])
+EXTRACTION_SCHEMA = pa.schema([
+    ('award_allowance_amount', pa.float64()),
+    ('award_date_issued', pa.string()),
+    ('applicant_name', pa.string()),
+    ('soldier_name', pa.string()),
+    ('service_info', SERVICE_INFO_TYPE),
+    ('act_date', pa.string()),
+    ('payment_frequency', pa.string()),
+    ('full_text', pa.string()),
+    ('award_granted_place', pa.string()),
+])
+
+
+class PensionInfoExtractor:
+    """
+    Pre-compiled version of extract_pension_info_v4.
+    Patterns are compiled once and reused for every segment, and
+    extract_batch returns a columnar pyarrow Table instead of a list of dicts.
+    """
+
+    # 1. Award allowance amount - check for both $ and Dollars (order matters, first match wins)
+    AMOUNT_PATTERNS = [
+        re.compile(r'at the rate of\s+(\d+(?:\.\d+)?)\s*\$', re.I),  # $ symbol
+        re.compile(r'at the rate of\s+(\d+(?:\.\d+)?)\s+Dollars', re.I),  # Dollars word
+        re.compile(r'(\d+(?:\.\d+)?)\s*\$', re.I),  # Just $ symbol
+        re.compile(r'(\d+(?:\.\d+)?)\s+Dollars', re.I),  # Just Dollars word
+        re.compile(r'rate of\s+(\d+(?:\.\d+)?)\s*\$', re.I),
+        re.compile(r'rate of\s+(\d+(?:\.\d+)?)\s+Dollars', re.I),
+    ]
+
+    # 2. Payment frequency analysis
+    FREQUENCY_PATTERNS = [
+        (re.compile(r'per annum', re.I), 'annual'),
+        (re.compile(r'per year', re.I), 'annual'),
+        (re.compile(r'annually', re.I), 'annual'),
+        (re.compile(r'semi-?annual', re.I), 'semi-annual'),
+        (re.compile(r'semi-?anl', re.I), 'semi-annual'),
+        (re.compile(r'semi-?anl\.', re.I), 'semi-annual'),
+        (re.compile(r'per month', re.I), 'monthly'),
+        (re.compile(r'monthly', re.I), 'monthly'),
+    ]
+
+    WHITESPACE = re.compile(r'\s+')
+    DATE_ISSUED = re.compile(r'Certificate of Pension issued the\s+(\d+(?:st|nd|rd|th)?)\s+day of\s+(\w+)\s+(\d{4})', re.I)
+    WIDOW_OF = re.compile(r'widow of\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+    NAME_IN_STATE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+of\s+[A-Za-z\s]+\s+in the State of')
+    RANK = re.compile(r'who was a\s+(Private|Sergeant|Captain|Colonel|Drummer|Musician)', re.I)
+    SERVICE_DURATION = re.compile(r'for(?:\s+the\s+term\s+of)?\s+(\d+\s+(?:months?|years?))', re.I)
+    SERVICE_PLACE = re.compile(r'in the State of\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+    LINE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+line')
+    ACT_DATE = re.compile(r'Act\s+(\w+)\s+(\d+),?\s+(\d{4})', re.I)
+    INSCRIBED_ROLL = re.compile(r'Inscribed on the Roll of\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+    ROLL = re.compile(r'Roll of\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+
+    def extract(self, text: str) -> Dict[str, any]:
+        """Extract structured information from a single text segment."""
+
+        result = {
+            'award_allowance_amount': None,
+            'award_date_issued': None,
+            'applicant_name': None,
+            'soldier_name': None,
+            'service_info': {
+                'service_place': None,
+                'rank': None,
+                'company_commanded_by': None,
+                'line': None,
+                'service_duration': None
+            },
+            'act_date': None,
+            'payment_frequency': None,  # New field for annual/semi-annual
+            'full_text': text,
+            'award_granted_place': None
+        }
+
+        # Clean text (a single pass - \s+ already covers newlines)
+        text_clean = self.WHITESPACE.sub(' ', text)
+
+        # 1. Award allowance amount
+        for pattern in self.AMOUNT_PATTERNS:
+            match = pattern.search(text_clean)
+            if match:
+                result['award_allowance_amount'] = float(match.group(1))
+                break
+
+        # 2. Payment frequency
+        for pattern, frequency in self.FREQUENCY_PATTERNS:
+            if pattern.search(text_clean):
+                result['payment_frequency'] = frequency
+                break
+
+        # 3. Award date issued
+        match = self.DATE_ISSUED.search(text_clean)
+        if match:
+            day = match.group(1).rstrip('stndrdth')
+            result['award_date_issued'] = f"{match.group(2)} {day}, {match.group(3)}"
+
+        # 4. Applicant name
+        match = self.WIDOW_OF.search(text_clean) or self.NAME_IN_STATE.search(text_clean)
+        if match:
+            result['applicant_name'] = match.group(1)
+            result['soldier_name'] = match.group(1)
+
+        # 5. Service information
+        service_info = result['service_info']
+        match = self.RANK.search(text_clean)
+        if match:
+            service_info['rank'] = match.group(1)
+
+        match = self.SERVICE_DURATION.search(text_clean)
+        if match:
+            service_info['service_duration'] = match.group(1)
+
+        match = self.SERVICE_PLACE.search(text_clean)
+        if match:
+            service_info['service_place'] = match.group(1)
+
+        match = self.LINE.search(text_clean)
+        if match:
+            service_info['line'] = match.group(1)
+
+        # 6. Act date
+        match = self.ACT_DATE.search(text_clean)
+        if match:
+            result['act_date'] = f"{match.group(1)} {match.group(2)}, {match.group(3)}"
+
+        # 7. Award granted place (state/colony on the roll)
+        match = self.INSCRIBED_ROLL.search(text_clean) or self.ROLL.search(text_clean)
+        if match:
+            result['award_granted_place'] = match.group(1)
+
+        return result
+
+    def extract_batch(self, segments: List[str]) -> pa.Table:
+        """
+        Extract structured information from a list of segments.
+        Returns a pyarrow Table with one column per field and service_info as a struct column.
+        """
+        columns = {field: [] for field in EXTRACTION_SCHEMA.names}
+        for segment in segments:
+            extracted = self.extract(segment)
+            for field, values in columns.items():
+                values.append(extracted[field])
+        return pa.Table.from_pydict(columns, schema=EXTRACTION_SCHEMA)
+
+
+# Shared instance so the module-level helpers don't recompile anything
+_extractor = PensionInfoExtractor()
+
+
+def extract_pension_info_v4(text: str) -> Dict[str, any]:
+    """Extract structured information from a single text segment."""
+    return _extractor.extract(text)
+
+
+def split_and_extract_pension_info(full_text: str) -> List[Dict[str, any]]:
+    """Split text by || markers and extract info from each segment."""
+    
+    # Split by || markers
+    segments = full_text.split('||')
+    
+    results = []
+    for i, segment in enumerate(segments):
+        if segment.strip():  # Only process non-empty segments
+            extracted = extract_pension_info_v4(segment.strip())
+            extracted['segment_number'] = i + 1  # Track which segment this came from
+            results.append(extracted)
+    
+    return results
+
+
+def _split_segments(samples: List[Dict[str, any]]):
+    """Split each sample's allowance_phrase by || and keep NAID/segment_number for every non-empty segment."""
+    segments, segment_numbers, naids = [], [], []
+    for sample in samples:
+        for i, segment in enumerate(sample['allowance_phrase'].split('||')):
+            if segment.strip():
+                segments.append(segment.strip())
+                segment_numbers.append(i + 1)
+                naids.append(sample['NAID'])
+    return segments, segment_numbers, naids
+
+
+def _extract_chunk(samples: List[Dict[str, any]]) -> pa.Table:
+    """Worker function - extract one chunk of samples into a table with segment_number and NAID columns."""
+    segments, segment_numbers, naids = _split_segments(samples)
+    table = _extractor.extract_batch(segments)
+    table = table.append_column('segment_number', pa.array(segment_numbers, type=pa.int32()))
+    table = table.append_column('NAID', pa.array([str(naid) for naid in naids], type=pa.string()))
+    return table
+
+
+def _remaining_samples(samples: List[Dict[str, any]], done_keys: Set[Tuple[str, int]]) -> List[Dict[str, any]]:
+    """Drop samples whose non-empty segments are all in done_keys (NAID, segment_number)."""
+    if not done_keys:
+        return samples
+    remaining = []
+    for sample in samples:
+        naid = str(sample['NAID'])
+        keys = [(naid, i + 1) for i, segment in enumerate(sample['allowance_phrase'].split('||')) if segment.strip()]
+        if not all(key in done_keys for key in keys):
+            remaining.append(sample)
+    return remaining
+
+
+def iter_extract_chunks(samples: List[Dict[str, any]], workers: int = None, chunk_size: int = 500,
+                        done_keys: Set[Tuple[str, int]] = None) -> Iterator[pa.Table]:
+    """
+    Run the extractor over all allowance-phrase samples using a process pool, yielding one table per chunk in order.
+    Segments whose (NAID, segment_number) is in done_keys are skipped, so an interrupted run can be resumed.
+    """
+    done_keys = done_keys or set()
+    samples = _remaining_samples(samples, done_keys)
+    chunks = [samples[i:i + chunk_size] for i in range(0, len(samples), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        tables = map(_extract_chunk, chunks)
+    else:
+        tables = _map_bounded(_extract_chunk, chunks, workers)
+
+    for table in tables:
+        if done_keys:
+            keep = [(naid, segment_number) not in done_keys for naid, segment_number
+                    in zip(table.column('NAID').to_pylist(), table.column('segment_number').to_pylist())]
+            table = table.filter(pa.array(keep))
+        yield table
+
+
+def _map_bounded(function, chunks, workers=None):
+    """
+    Run function over chunks in a process pool, yielding results in order.
+    At most 2 * workers chunks are in flight, so finished tables do not pile up ahead of the consumer.
+    """
+    workers = workers or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def extract_samples_parallel(samples: List[Dict[str, any]], workers: int = None, chunk_size: int = 500) -> pa.Table:
+    """
+    Run the extractor over all allowance-phrase samples using a process pool.
+    Each worker handles chunk_size samples at a time; the resulting tables are concatenated in order.
+    """
+    tables = list(iter_extract_chunks(samples, workers=workers, chunk_size=chunk_size))
+    if not tables:
+        return _extract_chunk([])
+    return pa.concat_tables(tables)
+
+
+class JsonlResultWriter:
+    """
+    Streams extraction results to a JSON Lines file (one segment per line) instead of one big json.dump.
+    Rows are buffered and flushed every batch_size rows, so memory stays constant and a crash loses at most
+    one batch. Re-opening an existing file appends to it; completed_keys() tells the driver what to skip.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, include_full_text: bool = True):
+        self.path = path
+        self.batch_size = batch_size
+        self.include_full_text = include_full_text
+        self.rows_written = 0
+        self._buffer = []
+        truncate_partial_line(path)  # a half-written last line from an interrupted run
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def completed_keys(self) -> Set[Tuple[str, int]]:
+        """Return the (NAID, segment_number) pairs already in the file."""
+        keys = set()
+        if not os.path.exists(self.path):
+            return keys
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    keys.add((str(row['NAID']), row['segment_number']))
+        return keys
+
+    def write_table(self, table: pa.Table):
+        """Buffer every row of an extraction table, flushing whenever batch_size rows are waiting."""
+        if not self.include_full_text and 'full_text' in table.column_names:
+            table = table.drop_columns(['full_text'])
+        for batch in table.to_batches(max_chunksize=self.batch_size):
+            self._buffer.extend(batch.to_pylist())
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self._file.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in self._buffer))
+        self._file.flush()
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def field_coverage(table: pa.Table) -> Dict[str, int]:
+    """Count non-null values for each extracted field (service_info fields as service_info.<field>)."""
+    coverage = {}
+    for field in TOP_LEVEL_FIELDS:
+        column = table.column(field)
+        coverage[field] = len(column) - column.null_count
+
+    service_info = table.column('service_info')
+    for field in SERVICE_FIELDS:
+        column = pc.struct_field(service_info, field)
+        coverage[f'service_info.{field}'] = len(column) - column.null_count
+
+    return coverage
+
+
+def frequency_breakdown(table: pa.Table) -> Dict[str, int]:
+    """Count segments per payment_frequency value (nulls excluded)."""
+    counts = pc.value_counts(table.column('payment_frequency').drop_null())
+    return {item['values'].as_py(): item['counts'].as_py() for item in counts}
+
+
+# Process all samples and save results
+if __name__ == "__main__":
+    print("Processing all samples with || splitting and payment frequency analysis...")
+    
+    # Load the sample data
+    with open('allowance_phrase_samples.json', 'r', encoding='utf-8') as f:
+        samples = json.load(f)
+    
+    print(f"Processing {len(samples)} samples...")
+    
+    # Results are streamed to JSONL; re-running picks up where an interrupted run stopped
+    output_file = 'extracted_pension_data_v3.jsonl'
+    total_segments = 0
+    coverage = {}
+    frequency_counts = {}
+    
+    with JsonlResultWriter(output_file) as writer:
+        done_keys = writer.completed_keys()
+        if done_keys:
+            print(f"Resuming - {len(done_keys)} segments already in {output_file}")
+        
+        # Split by || and extract from each segment (NAID and segment_number added per segment)
+        for table in iter_extract_chunks(samples, done_keys=done_keys):
+            writer.write_table(table)
+            total_segments += table.num_rows
+            for field, count in field_coverage(table).items():
+                coverage[field] = coverage.get(field, 0) + count
+            for freq, count in frequency_breakdown(table).items():
+                frequency_counts[freq] = frequency_counts.get(freq, 0) + count
+            print(f"Processed {total_segments} segments...")
+    
+    print(f"\nExtraction complete! Results saved to {output_file}")
+    if total_segments == 0:
+        print("Nothing left to process.")
+        raise SystemExit(0)
+    
+    print(f"Original samples: {len(samples)}")
+    print(f"Segments processed this run: {total_segments}")
+    
+    # Show summary statistics (for this run)
+    print("\nSummary statistics:")
+    print("-" * 50)
+    
+    # Count non-null values for each field
+    fields_to_check = [
+        'award_allowance_amount', 'award_date_issued', 'applicant_name', 
+        'soldier_name', 'act_date', 'award_granted_place', 'payment_frequency'
+    ]
+    for field in fields_to_check:
+        count = coverage[field]
+        print(f"{field}: {count}/{total_segments} ({count/total_segments*100:.1f}%)")
+    
+    # Service info fields
+    service_fields = ['service_place', 'rank', 'line', 'service_duration']
+    for field in service_fields:
+        count = coverage[f'service_info.{field}']
+        print(f"service_info.{field}: {count}/{total_segments} ({count/total_segments*100:.1f}%)")
+    
+    print(f"\nfull_text: {total_segments}/{total_segments} (100.0%) - All segments include full text")
+    
+    # Payment frequency breakdown
+    print("\nPayment frequency breakdown:")
+    print("-" * 30)
+    for freq, count in sorted(frequency_counts.items()):
+        print(f"{freq}: {count} segments ({count/total_segments*100:.1f}%)")
+    
+    # Show sample of results (read back from the output file)
+    print(f"\nSample of first 3 segments:")
+    print("-" * 40)
+    with open(output_file, 'r', encoding='utf-8') as f:
+        first_rows = [json.loads(line) for _, line in zip(range(3), f)]
+    for i, item in enumerate(first_rows):
+        print(f"\nSegment {i+1} (NAID: {item['NAID']}, Segment: {item['segment_number']}):")
+        for key, value in item.items():
+            if key not in ['full_text'] and value is not None:
+                if key == 'service_info':
+                    service_data = {k: v for k, v in value.items() if v is not None}
+                    if service_data:
+                        print(f"  {key}: {service_data}")
+                else:
+                    print(f"  {key}: {value}")
@@ -0,0 +1,465 @@
+import json
+import re
+from collections import Counter
+import random
+
+import numpy as np
+
+# numeric features - compared by magnitude in calculate_diversity_score, everything else is a boolean flag
+LENGTH_FEATURES = ['text_length', 'word_count', 'line_count', 'segment_count']
+
+def analyze_text_diversity(text):
+    """Analyze text for diversity indicators."""
+    
+    # Clean text
+    text_clean = text.replace('\n', ' ').lower()
+    
+    # Extract key features for diversity analysis
+    features = {
+        'has_widow': 'widow of' in text_clean,
+        'has_soldier_name': bool(re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+of\s+[A-Za-z\s]+\s+in the State of', text)),
+        'has_amount': bool(re.search(r'(\d+(?:\.\d+)?)\s*\$|(\d+(?:\.\d+)?)\s+Dollars', text_clean)),
+        'has_date': bool(re.search(r'(\d{4})', text)),
+        'has_rank': bool(re.search(r'(private|sergeant|captain|colonel|drummer|musician)', text_clean)),
+        'has_state': bool(re.search(r'in the State of\s+([A-Z][a-z]+)', text)),
+        'has_act': bool(re.search(r'act\s+(\w+)\s+(\d+)', text_clean)),
+        'has_semi_annual': bool(re.search(r'semi-?annual|semi-?anl', text_clean)),
+        'has_per_annum': 'per annum' in text_clean,
+        'has_per_month': 'per month' in text_clean,
+        'has_certificate': 'certificate' in text_clean,
+        'has_inscribed': 'inscribed' in text_clean,
+        'has_roll': 'roll' in text_clean,
+        'has_commenced': 'commence' in text_clean,
+        'has_arrears': 'arrears' in text_clean,
+        'has_revolutionary': 'revolutionary' in text_clean,
+        'has_pension': 'pension' in text_clean,
+        'has_war': 'war' in text_clean,
+        'has_company': 'company' in text_clean,
+        'has_regiment': 'regiment' in text_clean,
+        'has_captain': 'captain' in text_clean,
+        'has_colonel': 'colonel' in text_clean,
+        'has_line': 'line' in text_clean,
+        'has_service': 'service' in text_clean,
+        'has_discharged': 'discharge' in text_clean,
+        'has_enlisted': 'enlist' in text_clean,
+        'has_continental': 'continental' in text_clean,
+        'has_militia': 'militia' in text_clean,
+        'has_army': 'army' in text_clean,
+        'has_treasury': 'treasury' in text_clean,
+        'has_auditor': 'auditor' in text_clean,
+        'has_clerk': 'clerk' in text_clean,
+        'has_justice': 'justice' in text_clean,
+        'has_court': 'court' in text_clean,
+        'has_sworn': 'sworn' in text_clean,
+        'has_declaration': 'declaration' in text_clean,
+        'has_affidavit': 'affidavit' in text_clean,
+        'has_witness': 'witness' in text_clean,
+        'has_notary': 'notary' in text_clean,
+        'has_seal': 'seal' in text_clean,
+        'has_signature': 'signature' in text_clean,
+        'has_marriage': 'marriage' in text_clean or 'married' in text_clean,
+        'has_death': 'death' in text_clean or 'died' in text_clean or 'deceased' in text_clean,
+        'has_birth': 'birth' in text_clean or 'born' in text_clean,
+        'has_age': bool(re.search(r'\b\d+\s+years?\s+old|\bage\s+\d+', text_clean)),
+        'has_children': 'children' in text_clean or 'child' in text_clean,
+        'has_heir': 'heir' in text_clean,
+        'has_administrator': 'administrator' in text_clean,
+        'has_executor': 'executor' in text_clean,
+        'has_estate': 'estate' in text_clean,
+        'has_property': 'property' in text_clean,
+        'has_land': 'land' in text_clean,
+        'has_bounty': 'bounty' in text_clean,
+        'has_claim': 'claim' in text_clean,
+        'has_application': 'application' in text_clean,
+        'has_petition': 'petition' in text_clean,
+        'has_letter': 'letter' in text_clean,
+        'has_correspondence': 'correspondence' in text_clean,
+        'has_document': 'document' in text_clean,
+        'has_paper': 'paper' in text_clean,
+        'has_record': 'record' in text_clean,
+        'has_archive': 'archive' in text_clean,
+        'has_register': 'register' in text_clean,
+        'has_index': 'index' in text_clean,
+        'has_volume': 'volume' in text_clean,
+        'has_page': 'page' in text_clean,
+        'has_book': 'book' in text_clean,
+        'has_section': 'section' in text_clean,
+        'has_chapter': 'chapter' in text_clean,
+        'has_paragraph': 'paragraph' in text_clean,
+        'has_sentence': 'sentence' in text_clean,
+        'has_word': 'word' in text_clean,
+        'has_character': 'character' in text_clean,
+        'has_digit': bool(re.search(r'\d', text)),
+        'has_punctuation': bool(re.search(r'[.,;:!?]', text)),
+        'has_quotes': '"' in text or "'" in text,
+        'has_parentheses': '(' in text and ')' in text,
+        'has_brackets': '[' in text and ']' in text,
+        'has_dashes': '-' in text,
+        'has_underscores': '_' in text,
+        'has_pipes': '|' in text,
+        'has_ampersands': '&' in text,
+        'has_asterisks': '*' in text,
+        'has_hashes': '#' in text,
+        'has_percent': '%' in text,
+        'has_dollars': '$' in text,
+        'has_commas': ',' in text,
+        'has_periods': '.' in text,
+        'has_semicolons': ';' in text,
+        'has_colons': ':' in text,
+        'has_exclamations': '!' in text,
+        'has_questions': '?' in text,
+        'text_length': len(text),
+        'word_count': len(text.split()),
+        'line_count': text.count('\n'),
+        'segment_count': text.count('||') + 1,
+        'has_multiple_amounts': len(re.findall(r'(\d+(?:\.\d+)?)\s*\$|(\d+(?:\.\d+)?)\s+Dollars', text_clean)) > 1,
+        'has_multiple_dates': len(re.findall(r'(\d{4})', text)) > 1,
+        'has_multiple_states': len(re.findall(r'in the State of\s+([A-Z][a-z]+)', text)) > 1,
+        'has_multiple_names': len(re.findall(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+of\s+[A-Za-z\s]+\s+in the State of', text)) > 1,
+    }
+    
+    return features
+
+# ---------------------------------------------------------------------------
+# Single-scan feature extraction (same features as analyze_text_diversity, as a NumPy row)
+# ---------------------------------------------------------------------------
+
+# Column order of feature rows - identical to the keys of analyze_text_diversity
+FEATURE_NAMES = list(analyze_text_diversity('').keys())
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Flags set when any of the words appears as a substring of the lowercased text.
+# Every word is alphabetic, so it can only occur inside a single run of letters (token)
+KEYWORD_FEATURES = {
+    'has_rank': ['private', 'sergeant', 'captain', 'colonel', 'drummer', 'musician'],
+    'has_certificate': ['certificate'], 'has_inscribed': ['inscribed'], 'has_roll': ['roll'],
+    'has_commenced': ['commence'], 'has_arrears': ['arrears'], 'has_revolutionary': ['revolutionary'],
+    'has_pension': ['pension'], 'has_war': ['war'], 'has_company': ['company'], 'has_regiment': ['regiment'],
+    'has_captain': ['captain'], 'has_colonel': ['colonel'], 'has_line': ['line'], 'has_service': ['service'],
+    'has_discharged': ['discharge'], 'has_enlisted': ['enlist'], 'has_continental': ['continental'],
+    'has_militia': ['militia'], 'has_army': ['army'], 'has_treasury': ['treasury'], 'has_auditor': ['auditor'],
+    'has_clerk': ['clerk'], 'has_justice': ['justice'], 'has_court': ['court'], 'has_sworn': ['sworn'],
+    'has_declaration': ['declaration'], 'has_affidavit': ['affidavit'], 'has_witness': ['witness'],
+    'has_notary': ['notary'], 'has_seal': ['seal'], 'has_signature': ['signature'],
+    'has_marriage': ['marriage', 'married'], 'has_death': ['death', 'died', 'deceased'],
+    'has_birth': ['birth', 'born'], 'has_children': ['children', 'child'], 'has_heir': ['heir'],
+    'has_administrator': ['administrator'], 'has_executor': ['executor'], 'has_estate': ['estate'],
+    'has_property': ['property'], 'has_land': ['land'], 'has_bounty': ['bounty'], 'has_claim': ['claim'],
+    'has_application': ['application'], 'has_petition': ['petition'], 'has_letter': ['letter'],
+    'has_correspondence': ['correspondence'], 'has_document': ['document'], 'has_paper': ['paper'],
+    'has_record': ['record'], 'has_archive': ['archive'], 'has_register': ['register'], 'has_index': ['index'],
+    'has_volume': ['volume'], 'has_page': ['page'], 'has_book': ['book'], 'has_section': ['section'],
+    'has_chapter': ['chapter'], 'has_paragraph': ['paragraph'], 'has_sentence': ['sentence'],
+    'has_word': ['word'], 'has_character': ['character'],
+}
+
+# Multi-word phrases, checked directly on the lowercased text
+PHRASE_FEATURES = {'has_widow': 'widow of', 'has_per_annum': 'per annum', 'has_per_month': 'per month'}
+
+# Punctuation flags on the original text: (characters, all of them required)
+CHAR_FEATURES = {
+    'has_quotes': ('"\'', False), 'has_parentheses': ('()', True), 'has_brackets': ('[]', True),
+    'has_dashes': ('-', False), 'has_underscores': ('_', False), 'has_pipes': ('|', False),
+    'has_ampersands': ('&', False), 'has_asterisks': ('*', False), 'has_hashes': ('#', False),
+    'has_percent': ('%', False), 'has_dollars': ('$', False), 'has_commas': (',', False),
+    'has_periods': ('.', False), 'has_semicolons': (';', False), 'has_colons': (':', False),
+    'has_exclamations': ('!', False), 'has_questions': ('?', False),
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z]+')
+AMOUNT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*\$|(\d+(?:\.\d+)?)\s+Dollars')
+YEAR_PATTERN = re.compile(r'(\d{4})')
+STATE_PATTERN = re.compile(r'in the State of\s+([A-Z][a-z]+)')
+NAME_PATTERN = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+of\s+[A-Za-z\s]+\s+in the State of')
+ACT_PATTERN = re.compile(r'act\s+(\w+)\s+(\d+)')
+SEMI_ANNUAL_PATTERN = re.compile(r'semi-?annual|semi-?anl')
+AGE_PATTERN = re.compile(r'\b\d+\s+years?\s+old|\bage\s+\d+')
+DIGIT_PATTERN = re.compile(r'\d')
+PUNCTUATION_PATTERN = re.compile(r'[.,;:!?]')
+
+# token -> bitmask of the KEYWORD_FEATURES it triggers, shared across texts (the vocabulary repeats)
+_token_masks = {}
+_keyword_columns = [FEATURE_INDEX[name] for name in KEYWORD_FEATURES]
+
+
+def _token_mask(token):
+    mask = 0
+    for bit, words in enumerate(KEYWORD_FEATURES.values()):
+        if any(word in token for word in words):
+            mask |= 1 << bit
+    _token_masks[token] = mask
+    return mask
+
+
+def _count_matches(pattern, text, limit=2):
+    """Count regex matches, stopping once `limit` is reached (only 0 / 1 / more than 1 matter)."""
+    count = 0
+    for _ in pattern.finditer(text):
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+def fill_feature_row(text, row):
+    """
+    Write the analyze_text_diversity features for `text` into `row` (a length len(FEATURE_NAMES) array).
+    Keyword flags come from one tokenize pass: each distinct token is looked up once and the keyword
+    bitmasks are OR-ed together. Each regex runs once and serves both the has_ and has_multiple_ features.
+    """
+    text_clean = text.replace('\n', ' ').lower()
+    values = [0] * len(FEATURE_NAMES)
+
+    keyword_mask = 0
+    token_masks = _token_masks
+    for token in set(TOKEN_PATTERN.findall(text_clean)):
+        mask = token_masks.get(token)
+        keyword_mask |= _token_mask(token) if mask is None else mask
+    for bit, column in enumerate(_keyword_columns):
+        values[column] = (keyword_mask >> bit) & 1
+
+    for name, phrase in PHRASE_FEATURES.items():
+        values[FEATURE_INDEX[name]] = phrase in text_clean
+
+    chars = set(text)
+    for name, (required, need_all) in CHAR_FEATURES.items():
+        found = [char in chars for char in required]
+        values[FEATURE_INDEX[name]] = all(found) if need_all else any(found)
+
+    # each of these regexes needs a literal substring to match, so skip the (slow) scan when it is missing
+    has_state_phrase = 'in the State of' in text
+    has_amount_marker = '$' in text_clean or 'Dollars' in text_clean
+    amounts = _count_matches(AMOUNT_PATTERN, text_clean) if has_amount_marker else 0
+    years = _count_matches(YEAR_PATTERN, text)
+    states = _count_matches(STATE_PATTERN, text) if has_state_phrase else 0
+    names = _count_matches(NAME_PATTERN, text) if has_state_phrase else 0
+    values[FEATURE_INDEX['has_amount']] = amounts > 0
+    values[FEATURE_INDEX['has_multiple_amounts']] = amounts > 1
+    values[FEATURE_INDEX['has_date']] = years > 0
+    values[FEATURE_INDEX['has_multiple_dates']] = years > 1
+    values[FEATURE_INDEX['has_state']] = states > 0
+    values[FEATURE_INDEX['has_multiple_states']] = states > 1
+    values[FEATURE_INDEX['has_soldier_name']] = names > 0
+    values[FEATURE_INDEX['has_multiple_names']] = names > 1
+
+    values[FEATURE_INDEX['has_act']] = ACT_PATTERN.search(text_clean) is not None
+    values[FEATURE_INDEX['has_semi_annual']] = SEMI_ANNUAL_PATTERN.search(text_clean) is not None
+    values[FEATURE_INDEX['has_age']] = ('year' in text_clean or 'age' in text_clean) and AGE_PATTERN.search(text_clean) is not None
+    values[FEATURE_INDEX['has_digit']] = years > 0 or DIGIT_PATTERN.search(text) is not None
+    values[FEATURE_INDEX['has_punctuation']] = PUNCTUATION_PATTERN.search(text) is not None
+
+    values[FEATURE_INDEX['text_length']] = len(text)
+    values[FEATURE_INDEX['word_count']] = len(text.split())
+    values[FEATURE_INDEX['line_count']] = text.count('\n')
+    values[FEATURE_INDEX['segment_count']] = text.count('||') + 1
+
+    row[:] = values
+    return row
+
+
+def text_feature_row(text):
+    """Single-scan version of analyze_text_diversity, returned as a float32 NumPy row (columns = FEATURE_NAMES)."""
+    return fill_feature_row(text, np.zeros(len(FEATURE_NAMES), dtype=np.float32))
+
+
+def fill_feature_matrix(texts, out=None):
+    """
+    Batched text_feature_row - fills a preallocated (len(texts) x len(FEATURE_NAMES)) float32 matrix.
+    Pass `out` to reuse a buffer across batches.
+    """
+    if out is None:
+        out = np.zeros((len(texts), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, text in enumerate(texts):
+        fill_feature_row(text, out[i])
+    return out
+
+
+def calculate_diversity_score(features1, features2):
+    """Calculate diversity score between two feature sets."""
+    score = 0
+    for key in features1:
+        if key in features2:
+            if features1[key] != features2[key]:
+                score += 1
+            # Also consider magnitude differences for numeric features
+            if key in LENGTH_FEATURES:
+                diff = abs(features1[key] - features2[key])
+                score += min(diff / max(features1[key], features2[key], 1), 1)
+    return score
+
+def select_diverse_samples(samples, num_samples=10):
+    """Select the most diverse samples using a greedy algorithm."""
+    
+    if len(samples) <= num_samples:
+        return samples
+    
+    # Analyze all samples
+    print("Analyzing text diversity...")
+    analyzed_samples = []
+    for i, sample in enumerate(samples):
+        if i % 10 == 0:
+            print(f"Analyzing sample {i+1}/{len(samples)}...")
+        features = analyze_text_diversity(sample['allowance_phrase'])
+        analyzed_samples.append((sample, features))
+    
+    # Start with a random sample
+    selected = [random.choice(analyzed_samples)]
+    remaining = [s for s in analyzed_samples if s not in selected]
+    
+    print("Selecting diverse samples...")
+    while len(selected) < num_samples and remaining:
+        best_sample = None
+        best_score = -1
+        
+        for candidate in remaining:
+            # Calculate minimum diversity score to already selected samples
+            min_score = min(calculate_diversity_score(candidate[1], selected_sample[1]) 
+                          for selected_sample in selected)
+            
+            if min_score > best_score:
+                best_score = min_score
+                best_sample = candidate
+        
+        if best_sample:
+            selected.append(best_sample)
+            remaining.remove(best_sample)
+            print(f"Selected sample {len(selected)}/{num_samples} (diversity score: {best_score:.2f})")
+    
+    return [sample[0] for sample in selected]
+
+def build_feature_matrices(feature_dicts):
+    """
+    Convert a list of analyze_text_diversity dicts into
+      - a packed bit matrix (n x ceil(F/8) uint8) for the boolean features
+      - a float matrix (n x 4) for the length features
+    """
+    bool_keys = [key for key in feature_dicts[0] if key not in LENGTH_FEATURES]
+    bools = np.array([[features[key] for key in bool_keys] for features in feature_dicts], dtype=bool)
+    lengths = np.array([[features[key] for key in LENGTH_FEATURES] for features in feature_dicts], dtype=np.float64)
+    return np.packbits(bools, axis=1), lengths
+
+
+def split_feature_matrix(features):
+    """Same as build_feature_matrices, for a matrix from fill_feature_matrix."""
+    length_columns = [FEATURE_INDEX[name] for name in LENGTH_FEATURES]
+    bool_columns = [i for i in range(len(FEATURE_NAMES)) if i not in length_columns]
+    bools = features[:, bool_columns].astype(bool)
+    return np.packbits(bools, axis=1), features[:, length_columns].astype(np.float64)
+
+
+def _popcount(packed):
+    """Number of set bits per row of a packed uint8 matrix."""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return np.bitwise_count(packed).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(packed, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def diversity_scores_to(index, bits, lengths):
+    """
+    calculate_diversity_score between sample `index` and every sample, as one vector.
+    Boolean features count 1 per mismatch (XOR + popcount); length features count 1 per mismatch
+    plus the relative difference capped at 1.
+    """
+    scores = _popcount(bits ^ bits[index]).astype(np.float64)
+    diff = np.abs(lengths - lengths[index])
+    scale = np.maximum(np.maximum(lengths, lengths[index]), 1)
+    scores += (diff != 0).sum(axis=1) + np.minimum(diff / scale, 1).sum(axis=1)
+    return scores
+
+
+def select_diverse_samples_fast(samples, num_samples=10, feature_dicts=None):
+    """
+    Same greedy selection as select_diverse_samples, using farthest-point sampling over feature matrices.
+    Keeps a running minimum-distance vector, so each step is one vectorized distance computation
+    instead of comparing every candidate to every selected sample.
+    """
+    if len(samples) <= num_samples:
+        return samples
+
+    if feature_dicts is None:
+        print("Analyzing text diversity...")
+        features = fill_feature_matrix([sample['allowance_phrase'] for sample in samples])
+        bits, lengths = split_feature_matrix(features)
+    else:
+        bits, lengths = build_feature_matrices(feature_dicts)
+
+    # Start with a random sample
+    first = random.randrange(len(samples))
+    selected = [first]
+    min_scores = diversity_scores_to(first, bits, lengths)
+    min_scores[first] = -np.inf
+
+    print("Selecting diverse samples...")
+    while len(selected) < num_samples:
+        best = int(np.argmax(min_scores))
+        best_score = min_scores[best]
+        selected.append(best)
+        min_scores = np.minimum(min_scores, diversity_scores_to(best, bits, lengths))
+        min_scores[selected] = -np.inf
+        print(f"Selected sample {len(selected)}/{num_samples} (diversity score: {best_score:.2f})")
+
+    return [samples[i] for i in selected]
+
+def main():
+    print("Loading samples from both JSON files...")
+    
+    # Load samples from both files
+    all_samples = []
+    
+    with open('allowance_phrase_samples.json', 'r', encoding='utf-8') as f:
+        samples1 = json.load(f)
+        for sample in samples1:
+            sample['source_file'] = 'allowance_phrase_samples.json'
+        all_samples.extend(samples1)
+    
+    with open('allowance_phrase_samples_2.json', 'r', encoding='utf-8') as f:
+        samples2 = json.load(f)
+        for sample in samples2:
+            sample['source_file'] = 'allowance_phrase_samples_2.json'
+        all_samples.extend(samples2)
+    
+    print(f"Total samples loaded: {len(all_samples)}")
+    print(f"From allowance_phrase_samples.json: {len(samples1)}")
+    print(f"From allowance_phrase_samples_2.json: {len(samples2)}")
+    
+    # Select diverse samples
+    diverse_samples = select_diverse_samples_fast(all_samples, 10)
+    
+    # Save diverse samples
+    output_file = 'diverse_allowance_samples.json'
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(diverse_samples, f, indent=2, ensure_ascii=False)
+    
+    print(f"\nDiverse samples saved to {output_file}")
+    print(f"Selected {len(diverse_samples)} diverse samples")
+    
+    # Show summary of selected samples
+    print("\nSelected samples summary:")
+    print("-" * 50)
+    
+    source_counts = Counter(sample['source_file'] for sample in diverse_samples)
+    print(f"Source distribution: {dict(source_counts)}")
+    
+    # Show some statistics about the selected samples
+    total_length = sum(len(sample['allowance_phrase']) for sample in diverse_samples)
+    avg_length = total_length / len(diverse_samples)
+    print(f"Average text length: {avg_length:.0f} characters")
+    
+    segment_counts = [sample['allowance_phrase'].count('||') + 1 for sample in diverse_samples]
+    avg_segments = sum(segment_counts) / len(segment_counts)
+    print(f"Average segments per sample: {avg_segments:.1f}")
+    
+    # Show NAIDs of selected samples
+    naids = [sample['NAID'] for sample in diverse_samples]
+    print(f"Selected NAIDs: {naids}")
+    
+    # Show a sample of the diversity
+    print(f"\nSample diversity preview:")
+    print("-" * 30)
+    for i, sample in enumerate(diverse_samples[:3]):
+        text = sample['allowance_phrase'][:200] + "..." if len(sample['allowance_phrase']) > 200 else sample['allowance_phrase']
+        print(f"\nSample {i+1} (NAID: {sample['NAID']}, Source: {sample['source_file']}):")
+        print(f"Text preview: {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compact storage for the grouped NAID table (df_grouped_NAID_sorted_title_categories.parquet).
+
+Written as plain object strings, every column of the 78,926-row table is a Python str per row,
+and loading it takes gigabytes. The dtype plan:
+
+    NAID                 int64 (NAIDs are numbers stored as strings in the source data)
+    file_type, file_cat  category - parquet dictionary columns, read back as category
+    naraURL              dropped - always https://catalog.archives.gov/id/<NAID>
+    pageURL, pdfURL      stored as pagePath / pdfPath: each '||'-separated URL without the
+                         https://s3.amazonaws.com/NARAprodstorage/ prefix they all share (the rest
+                         of the path is not derivable from pageObjectId - reels and storage
+                         layouts differ)
+    title_prefix         dropped - set_categories' working copy of title
+
+pd.read_parquet already restores the category / int64 dtypes from the pandas metadata;
+read_grouped also compacts tables written before this format and, with urls=True (or
+with_urls on a subset), puts the full naraURL / pageURL / pdfURL columns back.
+"""
+
+NARA_URL_PREFIX = 'https://catalog.archives.gov/id/'
+STORAGE_URL_PREFIX = 'https://s3.amazonaws.com/NARAprodstorage/'
+SEPARATOR = '||'
+
+CATEGORY_COLUMNS = ['file_type', 'file_cat']
+# URL column -> column with the URLs shortened to their storage path
+PATH_COLUMNS = {'pageURL': 'pagePath', 'pdfURL': 'pdfPath'}
+URL_COLUMNS = {path_column: url_column for url_column, path_column in PATH_COLUMNS.items()}
+DROP_COLUMNS = ['naraURL', 'title_prefix']
+
+
+def _strip_prefix(value, prefix=STORAGE_URL_PREFIX):
+    """'||'-joined URLs -> '||'-joined paths without prefix (other values unchanged)."""
+    if not isinstance(value, str) or prefix not in value:
+        return value
+    return SEPARATOR.join(part[len(prefix):] if part.startswith(prefix) else part for part in value.split(SEPARATOR))
+
+
+def _add_prefix(value, prefix=STORAGE_URL_PREFIX):
+    """Inverse of _strip_prefix; empty parts stay empty."""
+    if not isinstance(value, str) or not value:
+        return value
+    return SEPARATOR.join(prefix + part if part and '://' not in part else part for part in value.split(SEPARATOR))
+
+
+def compact_grouped(df):
+    """The grouped table with the compact dtypes above (already compact columns are left as they are)."""
+    import pandas as pd
+
+    df = df.drop(columns=[column for column in DROP_COLUMNS if column in df.columns])
+    if 'NAID' in df.columns and df['NAID'].dtype != 'int64':
+        df['NAID'] = pd.to_numeric(df['NAID'], errors='raise').astype('int64')
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for url_column, path_column in PATH_COLUMNS.items():
+        if url_column in df.columns:
+            df[url_column] = df[url_column].map(_strip_prefix)
+            df = df.rename(columns={url_column: path_column})
+    return df
+
+
+def with_urls(df):
+    """Add naraURL / pageURL / pdfURL back (object strings) from NAID and the path columns."""
+    df = df.copy()
+    if 'NAID' in df.columns:
+        df['naraURL'] = NARA_URL_PREFIX + df['NAID'].astype(str)
+    for url_column, path_column in PATH_COLUMNS.items():
+        if path_column in df.columns:
+            df[url_column] = df[path_column].map(_add_prefix)
+    return df
+
+
+def write_grouped(df, path):
+    """Write the grouped table in the compact format."""
+    compact_grouped(df).to_parquet(path, index=False)
+
+
+def read_grouped(path, columns=None, urls=False):
+    """
+    Read the grouped table with the compact dtypes (from either format).
+    columns can name compact columns or naraURL / pageURL / pdfURL (which imply urls=True);
+    KeyError for a column the file neither has nor can derive (naraURL from NAID, pageURL /
+    pdfURL from their path columns and the other way round).
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    if columns is not None:
+        requested = list(columns)
+        available = set(pq.read_schema(path).names)
+        needed = set()
+        for column in requested:
+            if column == 'naraURL':
+                needed.add('NAID')
+            elif column in PATH_COLUMNS:
+                needed.add(PATH_COLUMNS[column] if PATH_COLUMNS[column] in available else column)
+            elif column in URL_COLUMNS and column not in available:
+                needed.add(URL_COLUMNS[column])
+            else:
+                needed.add(column)
+        missing = sorted(needed - available)
+        if missing:
+            raise KeyError(f"Columns not in {path} and not derivable: {missing}")
+        urls = urls or any(column == 'naraURL' or column in PATH_COLUMNS for column in requested)
+        df = pd.read_parquet(path, columns=list(needed))
+    else:
+        df = pd.read_parquet(path)
+
+    df = compact_grouped(df)
+    if urls:
+        df = with_urls(df)
+    if columns is not None:
+        df = df[requested]
+    return df
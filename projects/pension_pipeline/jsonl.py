@@ -0,0 +1,33 @@
+"""
+Helpers for the JSON Lines result files that the extraction runners append to
+(extract_all_samples_v3.JsonlResultWriter, llm_runner, pre_extract_router).
+"""
+
+import os
+
+
+def truncate_partial_line(path, block_size=1 << 16):
+    """
+    Drop a half-written last line left behind by an interrupted run, so the next append starts
+    on a fresh line. The file is scanned backwards from the end in block_size blocks, so only
+    the tail is read however large the file is.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b'\n':
+            return
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
@@ -15,20 +15,35 @@ Functions:
 from __future__ import annotations
 import json
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import pandas as pd
+if TYPE_CHECKING:  # annotations only
+    import pandas as pd
+
+from .profiling import first_len, profiled, section
 
 
 # ---------------------------------------------------------------------------
 # Helpers: text preference
 # ---------------------------------------------------------------------------
 
+def _isna(value):
+    """pd.isna for one value, without importing pandas for str / None / float values."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return False
+    if isinstance(value, float):
+        return value != value
+    import pandas as pd
+    return pd.isna(value)
+
+
 def _parse_json_text(text_value) -> str:
     """
     Parse JSON-serialized text (e.g., '["text content..."]') or return as-is.
     """
-    if not text_value or pd.isna(text_value):
+    if not text_value or _isna(text_value):
         return ""
     
     text_str = str(text_value).strip()
@@ -47,6 +62,7 @@ def _parse_json_text(text_value) -> str:
     # Return as-is if not JSON or parsing fails
     return text_str
 
+@profiled(rows=1)
 def choose_text(row: pd.Series) -> Tuple[str, str]:
     """
     Prefer 'transcriptionText' if present, else 'ocrText'.
@@ -176,6 +192,7 @@ def _split_after_id_segment(title: str) -> List[str]:
     parts = [p.strip(" .") for p in trailing.split(",")]
     return [x for x in parts if x]
 
+@profiled(rows=1)
 def parse_title_deterministic(title: str) -> Dict[str, Any]:
     """
     Deterministic parsing for the 'title' column.
@@ -210,6 +227,7 @@ def parse_title_deterministic(title: str) -> Dict[str, Any]:
 # Deterministic Date Extraction
 # ---------------------------------------------------------------------------
 
+@profiled(rows=1)
 def extract_dates_from_text(text: str) -> List[str]:
     """
     Extract dates from text content (OCR or transcription).
@@ -228,7 +246,7 @@ def extract_dates_from_text(text: str) -> List[str]:
     Returns:
         List of date strings found in the text
     """
-    if not text or pd.isna(text):
+    if not text or _isna(text):
         return []
     
     text_str = str(text).strip()
@@ -372,6 +390,7 @@ def _extract_mixed_years(text: str) -> List[str]:
     
     return years
 
+@profiled(rows=1)
 def identify_application_dates(text: str, extracted_dates: List[str], file_type_category: str = "") -> Dict[str, Any]:
     """
     Identify which extracted dates are likely related to application filing.
@@ -690,6 +709,7 @@ def identify_application_dates(text: str, extracted_dates: List[str], file_type_
 # Main Processing Function
 # ---------------------------------------------------------------------------
 
+@profiled(rows=first_len)
 def process_deterministic_only(df: pd.DataFrame) -> pd.DataFrame:
     """
     Process a dataframe using only deterministic parsing (no LLM).
@@ -742,7 +762,8 @@ def process_deterministic_only(df: pd.DataFrame) -> pd.DataFrame:
         }
     
     print("Processing titles deterministically...")
-    title_results = df['title'].apply(process_title_row)
+    with section('process_deterministic_only: titles', rows=len(df)):
+        title_results = df['title'].apply(process_title_row)
     
     df["parsed_title_json"] = [r['parsed_json'] for r in title_results]
     df["applicant_from_title"] = [r['applicant_from_title'] for r in title_results]
@@ -773,7 +794,8 @@ def process_deterministic_only(df: pd.DataFrame) -> pd.DataFrame:
         }
     
     print("Processing dates deterministically...")
-    dates_results = df.apply(process_dates_row, axis=1)
+    with section('process_deterministic_only: dates', rows=len(df)):
+        dates_results = df.apply(process_dates_row, axis=1)
     
     df["extracted_dates_json"] = [r['extracted_dates_json'] for r in dates_results]
     df["extracted_dates"] = [r['extracted_dates'] for r in dates_results]
@@ -1,9 +1,9 @@
-import pandas as pd
-
 def normalize_pension_frequency(freq):
     """
     Normalize pension frequency values to 'annual', 'monthly', or 'semi-annual'
     """
+    import pandas as pd  # only needed for pd.isna, imported on first call
+
     if pd.isna(freq) or freq is None or str(freq).lower().strip() in ['null', 'none']:
         return 'unknown'
     
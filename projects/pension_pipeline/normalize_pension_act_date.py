@@ -0,0 +1,69 @@
+import json
+import os
+from functools import lru_cache
+
+# projects/quantitative/historical_research/timeline.json - read on first use, not at import
+timeline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '../quantitative/historical_research/timeline.json')
+
+
+@lru_cache(maxsize=None)
+def load_timeline():
+    with open(timeline_path, 'r') as f:
+        return json.load(f)
+
+
+# Build the known acts mapping once (on first call)
+@lru_cache(maxsize=None)
+def load_known_acts():
+    known_acts = {}
+    for event in load_timeline():
+        if 'date' in event and event['date'] != 'archival-category':
+            known_acts[event['date']] = {
+                'context': event.get('historical_context', ''),
+                'categories': event.get('relevant_categories', ''),
+                'main_takeaway': event.get('main_takeaway', '')
+            }
+    return known_acts
+
+
+def __getattr__(name):
+    # module.timeline / module.known_acts still work, loaded on first access
+    if name == 'timeline':
+        return load_timeline()
+    if name == 'known_acts':
+        return load_known_acts()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Convert your pension_act_date to match timeline format (YYYY-MM-DD)
+def convert_to_timeline_format(date_str):
+    import pandas as pd  # on first call, so importing this module stays cheap
+
+    if pd.isna(date_str) or date_str is None or date_str == '':
+        return None
+    try:
+        # Convert MM/DD/YYYY to YYYY-MM-DD
+        return pd.to_datetime(date_str, format='%m/%d/%Y').strftime('%Y-%m-%d')
+    except:
+        return None
+
+
+def get_known_act_date(date_str):
+    """Convert date_str to timeline format and return the date if it's a known act"""
+    import pandas as pd
+
+    if pd.isna(date_str) or date_str is None:
+        return None
+    
+    # Convert to timeline format
+    converted_date = convert_to_timeline_format(date_str)
+    
+    if converted_date is None:
+        return None
+    
+    # Check if date exists in known acts
+    if converted_date in load_known_acts():
+        return converted_date
+    
+    return None
\ No newline at end of file
@@ -1,9 +1,9 @@
-import pandas as pd
-
 def normalize_yearly_amount(amount, frequency):
     """
     Calculate yearly amount based on payment amount and frequency
     """
+    import pandas as pd
+
     # Handle None, empty string, or invalid amounts
     if amount is None or amount == '' or pd.isna(amount):
         return None
@@ -1,4 +1,5 @@
 # functions designed for df_grouped_NAID_sorted_title.parquet
+from .profiling import first_len, profiled, section
 
 
 # file type groupings - column 'file_type'
@@ -21,12 +22,17 @@ category_dict = {
 # application categories - if no other category is found and one of these is found, set 'file_cat' to unknown
 unknown_group = ["blank", "illegible", "ctf"]  # (ctf = certificate)
 
+@profiled(rows=first_len)
 def run_categories(df):
     df = set_categories(df)
     df = set_application_categories(df)
+    # a handful of distinct values each - category dtype, written as parquet dictionary columns
+    df['file_type'] = df['file_type'].astype('category')
+    df['file_cat'] = df['file_cat'].astype('category')
     return df
 
 
+@profiled(rows=first_len)
 def set_categories(df):
     # quick clean to help groupings
     df['title_prefix'] = df['title'].str.replace('-', ' ')
@@ -46,6 +52,7 @@ def set_categories(df):
     return df
 
 # adds a new column 'title_modified' to the dataframe
+@profiled(rows=first_len)
 def clean_title(df):
     # remove application_prefix from title and other small clean
     df['title_modified'] = (df['title']
@@ -72,6 +79,7 @@ def clean_title(df):
 
 
 # set category for application files and otherwist set to non_application
+@profiled(rows=first_len)
 def set_application_categories(df):
     df = clean_title(df)
 
@@ -90,18 +98,20 @@ def set_application_categories(df):
     df.loc[mask_nara_admin & mask_non_app, 'file_cat'] = 'nara archival administrative sheets'
 
     # Multiple category method - append categories (allowing duplicates during iteration)
-    for key, values in category_dict.items():
-        for value in values:
-            if value:
-                pattern = f' {value} '
-                mask = df['title_modified'].str.contains(pattern, na=False) 
-                # Append category to existing file_cat (allowing duplicates) as long as file_cat is not non_application
-                df.loc[mask & mask_non_app, 'file_cat'] = df.loc[mask & mask_non_app, 'file_cat'] + f'{key}||'
+    with section('set_application_categories: category patterns', rows=len(df)):
+        for key, values in category_dict.items():
+            for value in values:
+                if value:
+                    pattern = f' {value} '
+                    mask = df['title_modified'].str.contains(pattern, na=False) 
+                    # Append category to existing file_cat (allowing duplicates) as long as file_cat is not non_application
+                    df.loc[mask & mask_non_app, 'file_cat'] = df.loc[mask & mask_non_app, 'file_cat'] + f'{key}||'
 
     # Clean up trailing separators, remove duplicates, and sort alphabetically
-    df['file_cat'] = df['file_cat'].str.rstrip('||').apply(
-        lambda x: '||'.join(sorted(list(set(x.split('||'))))) if x else x
-    )
+    with section('set_application_categories: sort file_cat', rows=len(df)):
+        df['file_cat'] = df['file_cat'].str.rstrip('||').apply(
+            lambda x: '||'.join(sorted(list(set(x.split('||'))))) if x else x
+        )
 
     mask_empty = df['file_cat'] == ''
 
@@ -1,12 +1,10 @@
 import { useRef, useEffect, forwardRef } from 'react';
 import * as d3 from 'd3';
 import './index.css';
-import categoryData from '../../data/viz_data/category_count_dict.json';
+import categoryData from '../../data/viz_data/category_counts.json';
 
 interface ImportedCategoryData {
   count: number;
-  NAIDs: string; // Pipe-separated string ("||") of NAIDs for application that contain a file in this category
-  page_count: string; // Pipe-separated string ("||") of page counts for each file in the category
   avg_page_count: number;
 }
 